@@ -4,14 +4,15 @@
 import datetime
 import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.routes import articles_router
 from app.api.models import ErrorResponse
-from app.db.database import init_db, close_db
+from app.db.database import HEALTHCHECK, close_db, get_session, init_db
 
 
 @asynccontextmanager
@@ -50,7 +51,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Ответы сериализуются orjson (C), datetime поддерживается без кастомных энкодеров
+    default_response_class=ORJSONResponse
 )
 
 # Настройка CORS
@@ -75,7 +78,7 @@ async def global_exception_handler(_request, exc):
     # Показываем детали ошибки только в режиме отладки
     debug_mode = os.getenv("DEBUG", "false").lower() == "true"
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error="Внутренняя ошибка сервера",
@@ -98,12 +101,23 @@ async def root():
 
 
 @app.get("/health", tags=["Health"])
-async def health_check():
-    """Проверка здоровья сервиса"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.datetime.now()
-    }
+async def health_check(db: AsyncSession = Depends(get_session)):
+    """Проверка здоровья сервиса и доступности базы данных"""
+    try:
+        await db.execute(HEALTHCHECK)
+        database_available = True
+    except Exception as e:
+        logger.warning(f"⚠️ База данных недоступна: {e}")
+        database_available = False
+
+    return ORJSONResponse(
+        status_code=200 if database_available else 503,
+        content={
+            "status": "healthy" if database_available else "unhealthy",
+            "database": "ok" if database_available else "unavailable",
+            "timestamp": datetime.datetime.now()
+        }
+    )
 
 
 # Middleware для логирования запросов
@@ -33,7 +33,7 @@ async def get_articles(
 
     # Базовый запрос
     query = select(Article)
-    count_query = select(func.count(Article.id))
+    count_query = select(func.count()).select_from(Article)
 
     # Применяем фильтры
     filters = []
@@ -56,8 +56,7 @@ async def get_articles(
         count_query = count_query.where(and_(*filters))
 
     # Считаем общее количество
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = await db.scalar(count_query)
 
     # Применяем пагинацию и сортировку
     query = query.order_by(desc(Article.published_at))
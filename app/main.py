@@ -10,6 +10,12 @@ from app.scheduler.scheduler import ScrapingScheduler
 from app.db.database import init_db, close_db
 from app.api.app import app as fastapi_app
 
+try:
+    # Цикл событий на libuv: быстрее стандартного для таймеров и сетевого I/O
+    import uvloop
+except ImportError:  # На Windows uvloop не поддерживается
+    uvloop = None
+
 # Загрузка переменных окружения
 load_dotenv()
 
@@ -31,11 +37,11 @@ logger.add(
 )
 
 
-async def run_scheduler():
+async def run_scheduler(scheduler_cls=ScrapingScheduler):
     """Запуск планировщика скрапинга"""
     try:
         logger.info("⏰ Запуск планировщика...")
-        scheduler = ScrapingScheduler()
+        scheduler = scheduler_cls()
         await scheduler.start()
     except Exception as e:
         logger.error(f"❌ Ошибка планировщика: {e}")
@@ -60,8 +66,8 @@ async def run_fastapi():
         raise
 
 
-async def main():
-    """Главная функция запуска приложения"""
+async def main(init_db=init_db, close_db=close_db, scheduler_cls=ScrapingScheduler, run_api=run_fastapi):
+    """Главная функция запуска приложения (зависимости можно передать явно, например в тестах)"""
     try:
         logger.info("🚀 Запуск Financial Times скрапера с FastAPI...")
         
@@ -73,8 +79,8 @@ async def main():
         
         # Запуск FastAPI и планировщика параллельно
         await asyncio.gather(
-            run_fastapi(),
-            run_scheduler(),
+            run_api(),
+            run_scheduler(scheduler_cls),
             return_exceptions=True
         )
         
@@ -90,5 +96,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Запуск приложения
-    asyncio.run(main())
\ No newline at end of file
+    # Запуск приложения (на uvloop, если он доступен)
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -2,19 +2,41 @@
 Планировщик задач для скрапинга Financial Times
 """
 import asyncio
+from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
 
-from app.scraper.scraper import FTScraper
+from app.scraper.scraper import FTScraper, get_scraper
+
+# Параметры задач по умолчанию: пропущенные запуски схлопываются в один,
+# следующий скрапинг не стартует, пока идет предыдущий
+JOB_DEFAULTS = {
+    'coalesce': True,
+    'max_instances': 1,
+    'misfire_grace_time': 300,
+}
 
 
 class ScrapingScheduler:
     """Планировщик для автоматического скрапинга новостей"""
 
-    def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-        self.scraper = FTScraper()
+    def __init__(self, scraper: Optional[FTScraper] = None):
+        self.scheduler = AsyncIOScheduler(job_defaults=JOB_DEFAULTS)
+        # По умолчанию общий скрапер процесса: один браузер на все время работы
+        self.scraper = scraper if scraper is not None else get_scraper()
+        # Устанавливается в stop(), start() ждет его без периодических пробуждений
+        self._stop_event = asyncio.Event()
+
+    def _schedule_hourly_job(self):
+        """Добавление почасовой задачи скрапинга в планировщик"""
+        self.scheduler.add_job(
+            self.hourly_scrape_job,
+            trigger=IntervalTrigger(hours=1),
+            id='hourly_scraping_job',
+            name='FT Hourly Scraping',
+            replace_existing=True
+        )
 
     async def initial_scrape_job(self):
         """Задача первоначального скрапинга (30 дней)"""
@@ -58,13 +80,7 @@ class ScrapingScheduler:
 
                 # Настраиваем почасовой режим для будущих запусков
                 logger.info("⏰ Настройка почасового режима для будущих запусков...")
-                self.scheduler.add_job(
-                    self.hourly_scrape_job,
-                    trigger=IntervalTrigger(hours=1),
-                    id='hourly_scraping_job',
-                    name='FT Hourly Scraping',
-                    replace_existing=True
-                )
+                self._schedule_hourly_job()
 
                 # Запускаем планировщик
                 self.scheduler.start()
@@ -76,21 +92,14 @@ class ScrapingScheduler:
                 await self.adaptive_scrape_job()
 
                 # Настраиваем почасовой режим
-                self.scheduler.add_job(
-                    self.hourly_scrape_job,
-                    trigger=IntervalTrigger(hours=1),
-                    id='hourly_scraping_job',
-                    name='FT Hourly Scraping',
-                    replace_existing=True
-                )
+                self._schedule_hourly_job()
 
                 # Запускаем планировщик
                 self.scheduler.start()
                 logger.info("✅ Планировщик запущен в почасовом режиме (каждый час)")
 
-            # Бесконечный цикл для работы планировщика
-            while True:
-                await asyncio.sleep(1)
+            # Ждем сигнала остановки, пока задачи выполняются планировщиком
+            await self._stop_event.wait()
 
         except KeyboardInterrupt:
             logger.info("⏹️ Получен сигнал остановки планировщика...")
@@ -109,6 +118,7 @@ class ScrapingScheduler:
 
     async def stop(self):
         """Остановка планировщика"""
+        self._stop_event.set()
         try:
             logger.info("🛑 Остановка планировщика...")
             if self.scheduler.running:
@@ -116,3 +126,4 @@ class ScrapingScheduler:
             logger.info("✅ Планировщик остановлен")
         except Exception as e:
             logger.error(f"❌ Ошибка остановки планировщика: {e}")
+        await self.scraper.close_browser()
@@ -0,0 +1,62 @@
+"""
+Патчи Playwright: облегченная замена inspect.stack(), который Playwright вызывает
+при каждом обращении к API. Включается переменной окружения PW_FAST_STACK=1
+"""
+import inspect
+import os
+import sys
+import types
+from typing import List
+
+from loguru import logger
+
+
+def _fast_stack(context: int = 1) -> List[inspect.FrameInfo]:
+    """Облегченный аналог inspect.stack(): без чтения исходников и вычисления позиций"""
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        frames.append(inspect.FrameInfo(frame, code.co_filename, frame.f_lineno, code.co_name, None, None))
+        frame = frame.f_back
+    return frames
+
+
+class _FastInspect(types.ModuleType):
+    """Модуль inspect, в котором stack() заменен на облегченную версию"""
+
+    stack = staticmethod(_fast_stack)
+
+    def __getattr__(self, name):
+        return getattr(inspect, name)
+
+
+# Патч трогает приватные модули Playwright, поэтому применяется не больше одного раза
+_applied = False
+
+
+def apply_playwright_patches() -> bool:
+    """Подменяет inspect.stack() в модулях Playwright, если задан PW_FAST_STACK=1. Возвращает True, если патч применен"""
+    global _applied
+    if _applied:
+        return True
+    if os.getenv("PW_FAST_STACK", "0") != "1":
+        return False
+
+    # Приватные модули могут переименовать в новой версии Playwright - тогда работаем без патча
+    try:
+        from playwright._impl import _connection, _network
+
+        fast_inspect = _FastInspect("inspect")
+        for module in (_connection, _network):
+            if not hasattr(module, "inspect"):
+                raise AttributeError(f"{module.__name__} не использует inspect")
+        for module in (_connection, _network):
+            module.inspect = fast_inspect
+    except (ImportError, AttributeError) as e:
+        logger.warning(f"⚠️ Патч inspect.stack() для Playwright не применен: {e}")
+        return False
+
+    _applied = True
+    logger.debug("⚡ inspect.stack() в Playwright заменен облегченной версией")
+    return True
@@ -3,34 +3,200 @@
 """
 import asyncio
 import datetime
-from typing import Optional, List, Dict, Any
+import io
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Set, Tuple
 from urllib.parse import urljoin
 
-from playwright.async_api import async_playwright, Page, Browser, ViewportSize
-from bs4 import BeautifulSoup
+from lxml import etree
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Playwright, Route, ViewportSize
 from loguru import logger
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.db.database import get_session
 from app.models.models import Article
-from sqlalchemy import select, func
+from app.scraper._patches import apply_playwright_patches
+from sqlalchemy import select, text
+from sqlalchemy.exc import DataError, IntegrityError
+
+
+def _has_class(name: str) -> str:
+    """XPath-условие на наличие класса в атрибуте class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Классы списка статей и его элементов
+ARTICLE_LIST_CLASS = 'o-teaser-collection__list'
+ARTICLE_ITEM_CLASS = 'o-teaser-collection__item'
+
+# Селектор списка статей, появления которого ждет Playwright после загрузки страницы
+ARTICLE_LIST_CSS = f'ul.{ARTICLE_LIST_CLASS}'
+
+# Предкомпилированные XPath-выражения: все нужные узлы тизера за один обход поддерева
+# на уровне C, результат идет в порядке документа
+_PREMIUM_LABEL_CLASS = 'o-labels--premium'
+_TEASER_LINK_FIELDS = (
+    ('o-teaser__tag', 'author'),
+    ('js-teaser-heading-link', 'title'),
+    ('js-teaser-standfirst-link', 'standfirst'),
+)
+_TEASER_LINKS_AND_TIME = f".//a[{' or '.join(_has_class(cls) for cls, _ in _TEASER_LINK_FIELDS)}] | .//time"
+_TEASER_FIELDS_XPATH = etree.XPath(f".//span[{_has_class(_PREMIUM_LABEL_CLASS)}] | {_TEASER_LINKS_AND_TIME}")
+# Если на странице нет ни одной премиум метки, ветка поиска span не нужна
+_TEASER_FIELDS_NO_PREMIUM_XPATH = etree.XPath(_TEASER_LINKS_AND_TIME)
+# Текстовые узлы элемента без содержимого script/style/template - как get_text() у BeautifulSoup
+_VISIBLE_TEXT_XPATH = etree.XPath(
+    "descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+)
+
+# Дата публикации в атрибуте title тега <time>, например "January 15 2024 10:30 am"
+# (пробелы могут повторяться, как допускал strptime с форматом "%B %d %Y %I:%M %p")
+_PUBLISH_DATE_RE = re.compile(r'([a-z]+)\s+(\d{1,2})\s+(\d{4})\s+(\d{1,2}):(\d{1,2})\s+([ap]m)', re.IGNORECASE)
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+
+# Типы ресурсов, которые не нужны для разбора списка статей и не загружаются
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+
+# После скольких страниц подряд без подходящих статей пагинация прекращается
+MAX_EMPTY_PAGES_IN_ROW = 2
+
+# Адреса FT
+FT_BASE_URL = "https://www.ft.com"
+FT_WORLD_URL = FT_BASE_URL + "/world"
+
+# Поля статьи, которые сохраняются в базу данных
+ARTICLE_COLUMNS = ('url', 'title', 'content', 'author', 'published_at', 'scraped_at')
+_ARTICLE_COLUMN_SET = frozenset(ARTICLE_COLUMNS)
+
+# Обязательные поля статьи
+REQUIRED_ARTICLE_FIELDS = ('url', 'title', 'content')
+
+# Поля, которые в таблице NOT NULL и должны быть датами
+_REQUIRED_DATE_FIELDS = ('published_at', 'scraped_at')
+
+# Максимальная длина строковых колонок таблицы статей (url, title, author)
+_ARTICLE_COLUMN_LENGTHS = {
+    column.name: column.type.length
+    for column in Article.__table__.columns
+    if getattr(column.type, 'length', None)
+}
+
+# INSERT ... ON CONFLICT для диалектов, которые его поддерживают
+_ON_CONFLICT_INSERTS = {'postgresql': pg_insert, 'sqlite': sqlite_insert}
+
+# Размер пакета, начиная с которого на PostgreSQL статьи загружаются через COPY
+COPY_THRESHOLD = 100
+
+# Статьи сохраняются в базу пакетами по мере скрапинга; пакет равен порогу COPY,
+# чтобы на PostgreSQL полные пакеты загружались через COPY
+SAVE_BATCH_SIZE = COPY_THRESHOLD
+
+# Сколько страниц статей может ждать сохранения, прежде чем скрапинг приостановится
+SAVE_QUEUE_SIZE = 4
+
+# За сколько дней URL уже сохраненных статей загружаются перед скрапингом
+KNOWN_URLS_DAYS = 7
+
+# Временная таблица для COPY, удаляется при завершении транзакции
+_CREATE_STAGING_TABLE = text(
+    "CREATE TEMP TABLE articles_staging ("
+    "url VARCHAR(1024), title VARCHAR(512), content TEXT, author VARCHAR(255), "
+    "published_at TIMESTAMPTZ, scraped_at TIMESTAMPTZ"
+    ") ON COMMIT DROP"
+)
+
+# Перенос статей из временной таблицы с пропуском дубликатов
+_INSERT_FROM_STAGING = text(
+    f"INSERT INTO articles ({', '.join(ARTICLE_COLUMNS)}) "
+    f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles_staging "
+    "ON CONFLICT (url) DO NOTHING RETURNING id"
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_publish_date_cached(date_str: str) -> datetime.datetime:
+    """Разбор даты публикации с кэшем: на странице у многих статей одинаковое время (ошибки не кэшируются)"""
+    match = _PUBLISH_DATE_RE.fullmatch(date_str)
+    if not match:
+        raise ValueError(date_str)
+    month_name, day, year, hour, minute, meridiem = match.groups()
+    hour = int(hour)
+    month = _MONTHS.get(month_name.lower())
+    if month is None or not 1 <= hour <= 12:
+        raise ValueError(date_str)
+    # 12-часовой формат: 12 am -> 0, 12 pm -> 12
+    hour = hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    return datetime.datetime(int(year), month, int(day), hour, int(minute), tzinfo=datetime.timezone.utc)
+
+
+def _utc_timestamp(moment: datetime.datetime) -> float:
+    """POSIX-время момента; наивная дата считается UTC, а не местным временем"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.timestamp()
+
+
+def _to_absolute_url(base_url: str, href: Optional[str]) -> str:
+    """Абсолютный URL статьи: ссылки вида /content/... просто дописываются к base_url"""
+    # urljoin разбирает оба адреса на каждый вызов, а почти все ссылки FT - простые пути от корня
+    if href and href.startswith('/') and not href.startswith('//') and '/.' not in href:
+        return base_url + href
+    return urljoin(base_url, href)
+
+
+async def _block_unneeded_resources(route: Route) -> None:
+    """Обработчик запросов страницы: картинки, шрифты, медиа и стили отменяются"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 class FTScraper:
     """Скрапер для Financial Times с поддержкой авторизации и сохранения сессии"""
 
-    def __init__(self):
-        self.base_url = "https://www.ft.com"
-        self.world_url = "https://www.ft.com/world"
+    # False, когда в базе уже есть статьи (общий для всех экземпляров)
+    _first_run_cache: Optional[bool] = None
+
+    def __init__(self, concurrency: int = 1, reuse_browser: bool = False):
+        self.base_url = FT_BASE_URL
+        self.world_url = FT_WORLD_URL
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self._playwright: Optional[Playwright] = None
+        # Браузер остается открытым между запусками и закрывается только через close_browser
+        self.reuse_browser = reuse_browser
         self.page: Optional[Page] = None
+        # Сколько страниц раздела загружается одновременно (у каждой своя вкладка)
+        self.concurrency = max(1, concurrency)
+        self._page_pool: Optional[asyncio.Queue] = None
+        # URL статей, уже собранных за текущий проход пагинации
+        self._seen_urls: Set[str] = set()
+        # URL недавних статей, которые уже есть в базе (загружаются перед каждым запуском)
+        self._known_urls: Set[str] = set()
 
     async def init_browser(self, max_retries: int = 3) -> None:
         """Инициализация браузера с повторными попытками"""
+        if self.browser is not None and self.browser.is_connected():
+            logger.debug("🌐 Используем уже запущенный браузер")
+            return
+
+        # Убираем inspect.stack() из горячего пути вызовов Playwright (только с PW_FAST_STACK=1)
+        apply_playwright_patches()
+
         for attempt in range(max_retries):
             try:
-                playwright = await async_playwright().start()
-                self.browser = await playwright.chromium.launch(
+                # Драйвер Playwright запускается один раз и переживает повторные попытки и перезапуски браузера
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self.browser = await self._playwright.chromium.launch(
                     headless=True,
                     args=[
                         '--no-sandbox',
@@ -41,7 +207,7 @@ class FTScraper:
                         '--no-first-run'
                     ]
                 )
-                context = await self.browser.new_context(
+                self.context = context = await self.browser.new_context(
                     user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                     viewport=ViewportSize(width=1920, height=1080)
                 )
@@ -50,7 +216,16 @@ class FTScraper:
                 context.set_default_timeout(30000)  # 30 секунд
                 context.set_default_navigation_timeout(30000)
 
+                # Лишние ресурсы отменяются для всех вкладок контекста, включая пул
+                await context.route("**/*", _block_unneeded_resources)
+
                 self.page = await context.new_page()
+                if self.concurrency > 1:
+                    # Пул вкладок для параллельного скрапинга пагинации
+                    self._page_pool = asyncio.Queue()
+                    self._page_pool.put_nowait(self.page)
+                    for _ in range(self.concurrency - 1):
+                        self._page_pool.put_nowait(await context.new_page())
                 logger.info("🌐 Браузер успешно инициализирован")
                 return
 
@@ -65,21 +240,40 @@ class FTScraper:
     async def close_browser(self) -> None:
         """Закрытие браузера"""
         try:
+            self._page_pool = None
             if self.browser:
                 await self.browser.close()
                 logger.info("🔴 Браузер закрыт")
+            if self._playwright:
+                await self._playwright.stop()
         except Exception as e:
             logger.error(f"❌ Ошибка закрытия браузера: {e}")
-
-    @staticmethod
-    async def is_first_run() -> bool:
+        finally:
+            self.browser = None
+            self.context = None
+            self._playwright = None
+
+    async def _release_browser(self) -> None:
+        """Закрытие браузера после запуска, если он не переиспользуется"""
+        # Отвалившийся браузер закрываем, чтобы следующий запуск поднял новый
+        if self.reuse_browser and self.browser is not None and self.browser.is_connected():
+            return
+        await self.close_browser()
+
+    @classmethod
+    async def is_first_run(cls) -> bool:
         """Проверка, является ли запуск первым (нет статей в базе)"""
+        # Как только статьи появились, первый запуск уже не вернется - база больше не нужна
+        if cls._first_run_cache is False:
+            return False
         try:
             async for session in get_session():
-                result = await session.execute(select(func.count(Article.id)))
-                count = result.scalar()
-                is_first = count == 0
-                logger.info(f"📊 Статей в базе: {count}, первый запуск: {is_first}")
+                # Достаточно найти одну статью, считать все не нужно
+                result = await session.execute(select(Article.id).limit(1))
+                is_first = result.first() is None
+                if not is_first:
+                    cls._first_run_cache = False
+                logger.info(f"📊 Первый запуск: {is_first}")
                 return is_first
             return True
         except Exception as e:
@@ -87,84 +281,173 @@ class FTScraper:
             return True  # По умолчанию считаем первым запуском
 
     @staticmethod
-    def _is_article_recent(published_at: datetime.datetime, hours_limit: int = 1) -> bool:
-        """Проверка, является ли статья недавней (в пределах указанного количества часов)"""
-        now = datetime.datetime.now(datetime.timezone.utc)
-        time_limit = now - datetime.timedelta(hours=hours_limit)
-        return published_at >= time_limit
+    async def _load_known_urls(days: int = KNOWN_URLS_DAYS) -> Set[str]:
+        """Загрузка URL статей, собранных за последние дни"""
+        try:
+            since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+            async for session in get_session():
+                result = await session.scalars(select(Article.url).where(Article.scraped_at >= since))
+                return set(result)
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось загрузить известные URL: {e}")
+        return set()
+
+    @staticmethod
+    def _is_article_recent(published_at: datetime.datetime, hours_limit: int = 1, *,
+                           now: Optional[datetime.datetime] = None) -> bool:
+        """Проверка, является ли статья недавней (в пределах указанного количества часов от now)"""
+        # Сравнение POSIX-времени: без арифметики datetime и создания timedelta на каждую статью
+        now_ts = _utc_timestamp(now) if now is not None else time.time()
+        return _utc_timestamp(published_at) >= now_ts - hours_limit * 3600
 
     @staticmethod
-    def _is_article_within_days(published_at: datetime.datetime, days_limit: int = 30) -> bool:
-        """Проверка, является ли статья в пределах указанного количества дней"""
-        now = datetime.datetime.now(datetime.timezone.utc)
-        time_limit = now - datetime.timedelta(days=days_limit)
-        return published_at >= time_limit
+    def _is_article_within_days(published_at: datetime.datetime, days_limit: int = 30, *,
+                                now: Optional[datetime.datetime] = None) -> bool:
+        """Проверка, является ли статья в пределах указанного количества дней от now"""
+        now_ts = _utc_timestamp(now) if now is not None else time.time()
+        return _utc_timestamp(published_at) >= now_ts - days_limit * 86400
 
     @staticmethod
     def _parse_publish_date(date_str: str) -> datetime.datetime:
         """Парсинг даты публикации из атрибута title"""
         try:
-            date_obj = datetime.datetime.strptime(date_str, "%B %d %Y %I:%M %p")
-            return date_obj.replace(tzinfo=datetime.timezone.utc)
+            return _parse_publish_date_cached(date_str)
         except ValueError:
             logger.warning(f"⚠️ Не удалось распарсить дату: {date_str}")
             return datetime.datetime.now(datetime.timezone.utc)
 
-    def _extract_article_data(self, article_element, time_filter_func=None) -> Optional[Dict[str, Any]]:
-        """Извлечение данных статьи из HTML элемента с опциональной фильтрацией по времени"""
-        try:
-            # Проверяем, не является ли статья премиум
-            premium_label = article_element.find('span', class_='o-labels--premium')
-            if premium_label:
-                logger.debug("⏭️ Пропускаем премиум статью")
-                return None
-
-            # Извлекаем автора (категорию)
-            author_element = article_element.find('a', class_='o-teaser__tag')
-            author = author_element.get_text(strip=True) if author_element else "Unknown"
+    def _build_article_data(self, title: str, relative_url: Optional[str], content: str, author: str,
+                            date_title: Optional[str], time_filter_func=None,
+                            scraped_at: Optional[datetime.datetime] = None) -> Optional[Dict[str, Any]]:
+        """Сборка данных статьи из извлеченных полей с опциональной фильтрацией по времени"""
+        if scraped_at is None:
+            scraped_at = datetime.datetime.now(datetime.timezone.utc)
 
-            # Извлекаем заголовок и URL
-            title_element = article_element.find('a', class_='js-teaser-heading-link')
-            if not title_element:
-                logger.warning("⚠️ Не найден заголовок статьи")
-                return None
+        # Дата публикации берется из атрибута title тега <time>
+        published_at = self._parse_publish_date(date_title) if date_title else scraped_at
 
-            title = title_element.get_text(strip=True)
-            relative_url = title_element.get('href')
-            full_url = urljoin(self.base_url, relative_url)
+        # Применяем фильтр по времени если он задан
+        if time_filter_func and not time_filter_func(published_at):
+            logger.debug(f"⏭️ Пропускаем статью по времени: {title[:50]}...")
+            return None
 
-            # Извлекаем краткое описание
-            standfirst_element = article_element.find('a', class_='js-teaser-standfirst-link')
-            content = standfirst_element.get_text(strip=True) if standfirst_element else ""
+        return {
+            'url': _to_absolute_url(self.base_url, relative_url),
+            'title': title,
+            'content': content,
+            'author': author,
+            'published_at': published_at,
+            'scraped_at': scraped_at
+        }
 
-            # Извлекаем дату публикации
-            time_element = article_element.find('time')
-            if time_element and time_element.get('title'):
-                published_at = self._parse_publish_date(time_element.get('title'))
-            else:
-                published_at = datetime.datetime.now(datetime.timezone.utc)
+    @staticmethod
+    def _element_text(element) -> str:
+        """Текст элемента lxml, как get_text(strip=True) у BeautifulSoup"""
+        return "".join(text.strip() for text in _VISIBLE_TEXT_XPATH(element))
+
+    def _extract_article_data_lxml(self, article_element, time_filter_func=None,
+                                   scraped_at: Optional[datetime.datetime] = None, *,
+                                   check_premium: bool = True) -> Optional[Dict[str, Any]]:
+        """Извлечение данных статьи из элемента lxml с опциональной фильтрацией по времени"""
+        fields_xpath = _TEASER_FIELDS_XPATH if check_premium else _TEASER_FIELDS_NO_PREMIUM_XPATH
+        try:
+            # Раскладываем узлы единственного обхода по полям, берем первое вхождение каждого
+            fields = {}
+            for node in fields_xpath(article_element):
+                if node.tag == 'span':
+                    logger.debug("⏭️ Пропускаем премиум статью")
+                    return None
+                if node.tag == 'time':
+                    fields.setdefault('time', node)
+                    continue
+                classes = node.get('class', '').split()
+                for css_class, field in _TEASER_LINK_FIELDS:
+                    if css_class in classes:
+                        fields.setdefault(field, node)
 
-            # Применяем фильтр по времени если он задан
-            if time_filter_func and not time_filter_func(published_at):
-                logger.debug(f"⏭️ Пропускаем статью по времени: {title[:50]}...")
+            # Извлекаем заголовок и URL
+            title_element = fields.get('title')
+            if title_element is None:
+                logger.warning("⚠️ Не найден заголовок статьи")
                 return None
 
-            return {
-                'url': full_url,
-                'title': title,
-                'content': content,
-                'author': author,
-                'published_at': published_at,
-                'scraped_at': datetime.datetime.now(datetime.timezone.utc)
-            }
+            author_element = fields.get('author')
+            standfirst_element = fields.get('standfirst')
+            time_element = fields.get('time')
+
+            return self._build_article_data(
+                self._element_text(title_element),
+                title_element.get('href'),
+                self._element_text(standfirst_element) if standfirst_element is not None else "",
+                self._element_text(author_element) if author_element is not None else "Unknown",
+                time_element.get('title') if time_element is not None else None,
+                time_filter_func,
+                scraped_at
+            )
 
         except Exception as e:
             logger.error(f"❌ Ошибка извлечения данных статьи: {e}")
             return None
 
-    async def scrape_single_page(self, page_num: int = 1, time_filter_func=None, max_retries: int = 3) -> List[
-        Dict[str, Any]]:
+    def _parse_articles_from_html(self, content: str, time_filter_func=None,
+                                  scraped_at: Optional[datetime.datetime] = None) -> List[Dict[str, Any]]:
+        """Разбор HTML страницы раздела в список статей за один проход по документу"""
+        # Время скрапинга одно на всю страницу
+        if scraped_at is None:
+            scraped_at = datetime.datetime.now(datetime.timezone.utc)
+        # Поиск подстроки в исходном HTML дешевле, чем искать метку в каждом тизере
+        check_premium = _PREMIUM_LABEL_CLASS in content
+
+        articles_data = []
+        articles_list = None
+        list_found = False
+        items_count = 0
+        try:
+            # Вся страница уже в памяти, поэтому выигрыш не в потоковом чтении, а в одном проходе:
+            # тизер разбирается, как только закрыт его тег, и сразу удаляется из дерева вместе с предыдущими
+            for _, element in etree.iterparse(io.BytesIO(content.encode('utf-8')), events=('end',),
+                                              tag=('ul', 'li'), html=True, encoding='utf-8'):
+                classes = (element.get('class') or '').split()
+                if element.tag == 'ul':
+                    list_found = list_found or ARTICLE_LIST_CLASS in classes
+                    continue
+                if ARTICLE_ITEM_CLASS not in classes:
+                    continue
+
+                # Разбираем только первый список статей, тизеры вне его (навигация и т.п.) пропускаем
+                parent_list = next((ul for ul in element.iterancestors('ul')
+                                    if ARTICLE_LIST_CLASS in (ul.get('class') or '').split()), None)
+                if parent_list is None:
+                    continue
+                if articles_list is None:
+                    articles_list = parent_list
+                elif parent_list is not articles_list:
+                    continue
+
+                items_count += 1
+                article_data = self._extract_article_data_lxml(element, time_filter_func, scraped_at,
+                                                               check_premium=check_premium)
+                if article_data:
+                    articles_data.append(article_data)
+
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except (etree.LxmlError, ValueError) as parse_error:
+            logger.warning(f"⚠️ Не удалось разобрать HTML страницы: {parse_error}")
+            return []
+
+        if not list_found:
+            logger.warning("⚠️ Не найден список статей на странице")
+            return []
+
+        logger.info(f"🔍 Найдено {items_count} элементов статей")
+        return articles_data
+
+    async def scrape_single_page(self, page_num: int = 1, time_filter_func=None, max_retries: int = 3,
+                                 page: Optional[Page] = None) -> List[Dict[str, Any]]:
         """Скрапинг одной страницы статей с повторными попытками"""
+        page = page or self.page
         for attempt in range(max_retries):
             try:
                 # Формируем URL страницы
@@ -177,44 +460,24 @@ class FTScraper:
 
                 # Переходим на страницу с обработкой таймаутов
                 try:
-                    await self.page.goto(url, wait_until='networkidle', timeout=30000)
+                    await page.goto(url, wait_until='networkidle', timeout=30000)
                 except Exception as nav_error:
                     logger.warning(f"⚠️ Ошибка навигации на страницу {page_num}: {nav_error}")
                     # Пробуем без ожидания networkidle
-                    await self.page.goto(url, wait_until='load', timeout=30000)
+                    await page.goto(url, wait_until='load', timeout=30000)
 
                 # Ждем загрузки контента
                 await asyncio.sleep(2)
 
                 # Ждем появления списка статей
                 try:
-                    await self.page.wait_for_selector('ul.o-teaser-collection__list', timeout=10000)
+                    await page.wait_for_selector(ARTICLE_LIST_CSS, timeout=10000)
                 except TimeoutError:
                     logger.warning(f"⚠️ Список статей не найден на странице {page_num}")
 
                 # Получаем HTML контент
-                content = await self.page.content()
-                soup = BeautifulSoup(content, 'html.parser')
-
-                # Находим список статей
-                articles_list = soup.find('ul', class_='o-teaser-collection__list')
-                if not articles_list:
-                    logger.warning(f"⚠️ Не найден список статей на странице {page_num}")
-                    return []
-
-                # Извлекаем все элементы статей
-                article_items = articles_list.find_all('li', class_='o-teaser-collection__item')
-                logger.info(f"🔍 Найдено {len(article_items)} элементов статей на странице {page_num}")
-
-                articles_data = []
-                for item in article_items:
-                    try:
-                        article_data = self._extract_article_data(item, time_filter_func)
-                        if article_data:
-                            articles_data.append(article_data)
-                    except Exception as extract_error:
-                        logger.warning(f"⚠️ Ошибка извлечения данных статьи: {extract_error}")
-                        continue
+                content = await page.content()
+                articles_data = self._parse_articles_from_html(content, time_filter_func)
 
                 logger.info(f"✅ Успешно извлечено {len(articles_data)} статей со страницы {page_num}")
                 return articles_data
@@ -231,37 +494,82 @@ class FTScraper:
 
         return []  # Возвращаем пустой список если все попытки неудачны
 
-    async def scrape_articles_with_pagination(self, max_pages: int = 10, time_filter_func=None) -> List[Dict[str, Any]]:
-        """Скрапинг статей с пагинацией"""
+    async def scrape_articles_with_pagination(self, max_pages: int = 10, time_filter_func=None,
+                                              article_queue: Optional[asyncio.Queue] = None) -> List[Dict[str, Any]]:
+        """Скрапинг статей с пагинацией (еще не сохраненные статьи каждой страницы передаются в article_queue)"""
+        # При ошибке возвращаются статьи, собранные до нее: они уже могли уйти на сохранение
+        all_articles = []
         try:
             logger.info(f"📚 Начинаем скрапинг с пагинацией (макс. {max_pages} страниц)...")
 
-            all_articles = []
             no_articles_count = 0
             page_num = 0
-
-            for page_num in range(1, max_pages + 1):
-                page_articles = await self.scrape_single_page(page_num, time_filter_func)
-
-                if not page_articles:
-                    no_articles_count += 1
-                    logger.warning(f"⚠️ Страница {page_num} не содержит подходящих статей")
-
-                    # Если 3 страницы подряд без статей - прекращаем
-                    if no_articles_count >= 3:
-                        logger.info("🛑 Найдено 3 страницы подряд без статей, прекращаем скрапинг")
-                        break
+            stop = False
+            self._seen_urls = set()
+            # Прошла ли фильтр по времени первая статья каждой страницы
+            first_article_ok: Dict[int, bool] = {}
+
+            # Страницы загружаются окнами по числу вкладок в пуле, без пула - по одной
+            window = self.concurrency if self._page_pool is not None else 1
+
+            for window_start in range(1, max_pages + 1, window):
+                page_nums = range(window_start, min(window_start + window, max_pages + 1))
+                if window == 1:
+                    results = [await self.scrape_single_page(
+                        window_start, self._track_first_article(time_filter_func, window_start, first_article_ok)
+                    )]
                 else:
-                    no_articles_count = 0  # Сбрасываем счетчик
-                    all_articles.extend(page_articles)
-
-                    # При использовании временного фильтра проверяем последнюю статью
-                    if time_filter_func and page_articles:
-                        last_article_date = page_articles[-1]['published_at']
-                        # Если последняя статья на странице слишком старая, прекращаем
-                        if not time_filter_func(last_article_date):
-                            logger.info(f"🕐 Достигнут временной лимит на странице {page_num}, прекращаем скрапинг")
+                    results = await asyncio.gather(*(
+                        self._scrape_page_from_pool(num, self._track_first_article(time_filter_func, num, first_article_ok))
+                        for num in page_nums
+                    ))
+
+                # Результаты окна разбираются по порядку страниц, как при последовательном обходе
+                for page_num, page_articles in zip(page_nums, results):
+                    if not page_articles:
+                        no_articles_count += 1
+                        logger.warning(f"⚠️ Страница {page_num} не содержит подходящих статей")
+
+                        # Если несколько страниц подряд без статей - прекращаем
+                        if no_articles_count >= MAX_EMPTY_PAGES_IN_ROW:
+                            logger.info(f"🛑 Найдено {no_articles_count} страницы подряд без статей, прекращаем скрапинг")
+                            stop = True
                             break
+                    else:
+                        no_articles_count = 0  # Сбрасываем счетчик
+                        # Статьи, которые сдвинулись между страницами, попадают в выдачу дважды
+                        new_articles = []
+                        for article in page_articles:
+                            if article['url'] not in self._seen_urls:
+                                self._seen_urls.add(article['url'])
+                                new_articles.append(article)
+                        all_articles.extend(new_articles)
+                        if article_queue is not None:
+                            # Статьи, которые уже есть в базе, на сохранение не отправляются
+                            unsaved_articles = [
+                                article for article in new_articles if article['url'] not in self._known_urls
+                            ]
+                            if unsaved_articles:
+                                await article_queue.put(unsaved_articles)
+
+                        # При использовании временного фильтра проверяем последнюю статью
+                        if time_filter_func and page_articles:
+                            last_article_date = page_articles[-1]['published_at']
+                            # Если последняя статья на странице слишком старая, прекращаем
+                            if not time_filter_func(last_article_date):
+                                logger.info(f"🕐 Достигнут временной лимит на странице {page_num}, прекращаем скрапинг")
+                                stop = True
+                                break
+
+                    # Статьи идут от новых к старым: если первая статья страницы старше лимита,
+                    # на следующих страницах подходящих статей уже не будет
+                    if first_article_ok.get(page_num) is False:
+                        logger.info(f"🕐 Первая статья страницы {page_num} старше лимита, прекращаем скрапинг")
+                        stop = True
+                        break
+
+                if stop:
+                    break
 
                 # Небольшая пауза между страницами
                 await asyncio.sleep(1)
@@ -271,64 +579,223 @@ class FTScraper:
 
         except Exception as e:
             logger.error(f"❌ Ошибка скрапинга с пагинацией: {e}")
-            return []
+            return all_articles
+
+    @staticmethod
+    def _track_first_article(time_filter_func, page_num: int, first_article_ok: Dict[int, bool]):
+        """Фильтр по времени для страницы, запоминающий результат для ее первой статьи"""
+        if time_filter_func is None:
+            return None
+
+        def page_time_filter(published_at: datetime.datetime) -> bool:
+            passed = time_filter_func(published_at)
+            first_article_ok.setdefault(page_num, passed)
+            return passed
+
+        return page_time_filter
+
+    async def _scrape_page_from_pool(self, page_num: int, time_filter_func=None) -> List[Dict[str, Any]]:
+        """Скрапинг страницы во вкладке, взятой из пула"""
+        page = await self._page_pool.get()
+        try:
+            return await self.scrape_single_page(page_num, time_filter_func, page=page)
+        finally:
+            self._page_pool.put_nowait(page)
+
+    async def _save_from_queue(self, article_queue: asyncio.Queue) -> Tuple[int, int]:
+        """Сохранение статей из очереди пакетами, пока не придет None. Возвращает (получено, сохранено)"""
+        queued_count = 0
+        saved_count = 0
+        batch = []
+        while True:
+            page_articles = await article_queue.get()
+            if page_articles is None:
+                break
+            queued_count += len(page_articles)
+            batch.extend(page_articles)
+            if len(batch) >= SAVE_BATCH_SIZE:
+                saved_count += await self.save_articles_to_db(batch)
+                batch = []
+
+        if batch:
+            saved_count += await self.save_articles_to_db(batch)
+        return queued_count, saved_count
+
+    async def _scrape_and_save(self, max_pages: int, time_filter_func=None) -> Tuple[List[Dict[str, Any]], int]:
+        """Скрапинг с пагинацией, при котором статьи сохраняются в базу, пока загружаются следующие страницы.
+        Возвращает (все собранные статьи, число сохраненных)"""
+        # Статьи, которые уже есть в базе, не отправляются на сохранение повторно
+        self._known_urls = await self._load_known_urls()
+
+        article_queue: asyncio.Queue = asyncio.Queue(maxsize=SAVE_QUEUE_SIZE)
+        consumer = asyncio.create_task(self._save_from_queue(article_queue))
+        try:
+            articles_data = await self.scrape_articles_with_pagination(
+                max_pages=max_pages,
+                time_filter_func=time_filter_func,
+                article_queue=article_queue
+            )
+        finally:
+            await article_queue.put(None)
+            _, saved_count = await consumer
+            # Известные URL относятся только к этому запуску
+            self._known_urls = set()
+
+        return articles_data, saved_count
 
     async def scrape_articles_list(self, time_filter_func=None) -> List[Dict[str, Any]]:
         """Скрапинг списка статей с главной страницы мира (без пагинации)"""
         return await self.scrape_single_page(1, time_filter_func)
 
     @staticmethod
-    async def save_articles_to_db(articles_data: List[Dict[str, Any]], max_retries: int = 3) -> int:
-        """Сохранение статей в базу данных с обработкой ошибок"""
+    def _is_valid_article(article_data: Dict[str, Any]) -> bool:
+        """Проверка, что статья пройдет ограничения таблицы: NOT NULL, типы дат и длина строк"""
+        if not all(key in article_data for key in REQUIRED_ARTICLE_FIELDS):
+            return False
+        # Пустой content допустим (у тизера может не быть описания), но не None
+        if not article_data['url'] or not article_data['title'] or not isinstance(article_data['content'], str):
+            return False
+        if not all(isinstance(article_data.get(field), datetime.datetime) for field in _REQUIRED_DATE_FIELDS):
+            return False
+        return all(
+            len(article_data.get(column) or '') <= length
+            for column, length in _ARTICLE_COLUMN_LENGTHS.items()
+        )
+
+    @staticmethod
+    def _prepare_article_rows(articles_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Валидация статей и приведение их к строкам таблицы с одинаковым набором колонок"""
+        rows = []
+        for article_data in articles_data:
+            if not FTScraper._is_valid_article(article_data):
+                logger.warning(f"⚠️ Пропущена статья с неполными данными: {article_data.get('title', 'Unknown')}")
+                continue
+            # Статьи из _extract_article_data_lxml уже имеют ровно нужные колонки - копировать их незачем
+            if article_data.keys() == _ARTICLE_COLUMN_SET:
+                rows.append(article_data)
+            else:
+                rows.append({column: article_data.get(column) for column in ARTICLE_COLUMNS})
+        return rows
+
+    @staticmethod
+    def _insert_ignoring_duplicates(dialect_name: str):
+        """INSERT ... ON CONFLICT (url) DO NOTHING RETURNING id для диалекта базы данных"""
+        insert = _ON_CONFLICT_INSERTS[dialect_name]
+        articles_table = Article.__table__
+        return (
+            insert(articles_table)
+            .on_conflict_do_nothing(index_elements=['url'])
+            .returning(articles_table.c.id)
+        )
+
+    @staticmethod
+    async def _insert_new_articles(session, rows: List[Dict[str, Any]]) -> int:
+        """Сохранение статей без ON CONFLICT: один SELECT уже известных URL и один пакетный INSERT"""
+        result = await session.scalars(
+            select(Article.url).where(Article.url.in_({row['url'] for row in rows}))
+        )
+        seen_urls = set(result.all())
+
+        new_rows = []
+        for row in rows:
+            # Дубликаты отсекаются и среди уже сохраненных, и внутри самого пакета
+            if row['url'] not in seen_urls:
+                seen_urls.add(row['url'])
+                new_rows.append(row)
+
+        if new_rows:
+            await session.execute(Article.__table__.insert(), new_rows)
+        return len(new_rows)
+
+    @staticmethod
+    async def _bulk_copy_articles(session, rows: List[Dict[str, Any]]) -> int:
+        """Загрузка большого пакета статей через COPY во временную таблицу (только PostgreSQL/asyncpg)"""
+        # Временная таблица создается через сессию, чтобы она попала в текущую транзакцию
+        await session.execute(_CREATE_STAGING_TABLE)
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        # COPY идет мимо SQLAlchemy, поэтому ошибки asyncpg приводятся к исключениям SQLAlchemy сами
+        from asyncpg.exceptions import DataError as PgDataError, IntegrityConstraintViolationError
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(
+                'articles_staging',
+                records=[tuple(row[column] for column in ARTICLE_COLUMNS) for row in rows],
+                columns=list(ARTICLE_COLUMNS)
+            )
+        except PgDataError as e:
+            raise DataError("COPY articles_staging", None, e) from e
+        except IntegrityConstraintViolationError as e:
+            raise IntegrityError("COPY articles_staging", None, e) from e
+
+        result = await session.execute(_INSERT_FROM_STAGING)
+        return len(result.scalars().all())
+
+    @staticmethod
+    async def _insert_rows(session, dialect_name: str, rows: List[Dict[str, Any]]) -> int:
+        """Пакетная вставка строк с пропуском дубликатов; возвращает число новых статей"""
+        if dialect_name == 'postgresql' and len(rows) >= COPY_THRESHOLD:
+            return await FTScraper._bulk_copy_articles(session, rows)
+        if dialect_name not in _ON_CONFLICT_INSERTS:
+            return await FTScraper._insert_new_articles(session, rows)
+        stmt = FTScraper._insert_ignoring_duplicates(dialect_name)
+        result = await session.execute(stmt, rows)
+        # RETURNING возвращает id только реально вставленных строк
+        return len(result.scalars().all())
+
+    @staticmethod
+    async def _insert_rows_one_by_one(session, dialect_name: str, rows: List[Dict[str, Any]]) -> int:
+        """Вставка по одной строке в SAVEPOINT: строки, отклоненные базой, пропускаются"""
         saved_count = 0
-        failed_count = 0
+        for row in rows:
+            try:
+                async with session.begin_nested():
+                    saved_count += await FTScraper._insert_rows(session, dialect_name, [row])
+            except (IntegrityError, DataError) as e:
+                logger.warning(f"⚠️ Статья отклонена базой данных: {row.get('url')}: {e.orig}")
+        return saved_count
 
+    @staticmethod
+    async def save_articles_to_db(articles_data: List[Dict[str, Any]], max_retries: int = 3) -> int:
+        """Сохранение статей в базу данных одним пакетным INSERT с пропуском дубликатов"""
         if not articles_data:
             logger.info("📝 Нет статей для сохранения")
             return 0
 
+        # Валидация данных перед сохранением
+        rows = FTScraper._prepare_article_rows(articles_data)
+        if not rows:
+            logger.info("📝 Нет валидных статей для сохранения")
+            return 0
+
         for attempt in range(max_retries):
             try:
                 async for session in get_session():
-                    batch_saved = 0
-
-                    for i, article_data in enumerate(articles_data):
+                    dialect_name = session.get_bind().dialect.name
+                    try:
+                        saved_count = await FTScraper._insert_rows(session, dialect_name, rows)
+                        await session.commit()
+                    except (IntegrityError, DataError) as e:
+                        # Ошибка данных не исправится повтором: сохраняем пакет по одной статье
+                        await session.rollback()
+                        logger.warning(f"⚠️ Пакет отклонен базой данных ({e.orig}), сохраняем статьи по одной")
                         try:
-                            # Валидация данных перед сохранением
-                            if not all(key in article_data for key in ['url', 'title', 'content']):
-                                logger.warning(
-                                    f"⚠️ Пропущена статья с неполными данными: {article_data.get('title', 'Unknown')}")
-                                continue
-
-                            # Создаем объект статьи
-                            article = Article(**article_data)
-
-                            # Добавляем в сессию
-                            session.add(article)
+                            saved_count = await FTScraper._insert_rows_one_by_one(session, dialect_name, rows)
                             await session.commit()
-                            batch_saved += 1
-                            saved_count += 1
-                            logger.debug(f"💾 Сохранена статья: {article.title[:50]}...")
-
-                        except IntegrityError:
-                            # Статья уже существует (дублирование по URL)
-                            await session.rollback()
-                            logger.debug(f"⏭️ Статья уже существует: {article_data.get('title', 'Unknown')[:50]}...")
-                            continue
-
-                        except Exception as e:
+                        except Exception:
                             await session.rollback()
-                            failed_count += 1
-                            logger.warning(f"⚠️ Ошибка сохранения статьи {i + 1}: {e}")
+                            raise
+                    except Exception:
+                        await session.rollback()
+                        raise
 
-                            # Если много ошибок подряд, прерываем
-                            if failed_count > 5:
-                                logger.error("❌ Слишком много ошибок сохранения, прерываем операцию")
-                                break
-                            continue
+                    if saved_count:
+                        FTScraper._first_run_cache = False
 
-                    logger.info(f"📦 Обработан batch: сохранено {batch_saved} статей")
-                    break  # Успешно завершили, выходим из цикла попыток
+                    logger.info(
+                        f"✅ Итого сохранено {saved_count} новых статей в базу данных "
+                        f"(пропущено дубликатов: {len(rows) - saved_count})")
+                    return saved_count
 
             except Exception as e:
                 logger.warning(f"⚠️ Попытка {attempt + 1}/{max_retries} сохранения в БД неудачна: {e}")
@@ -337,11 +804,15 @@ class FTScraper:
                 else:
                     logger.error(f"❌ Не удалось сохранить данные в БД после {max_retries} попыток")
 
-        logger.info(f"✅ Итого сохранено {saved_count} новых статей в базу данных")
-        if failed_count > 0:
-            logger.warning(f"⚠️ Не удалось сохранить {failed_count} статей из-за ошибок")
+        return 0
 
-        return saved_count
+    def _make_time_filter(self, days: Optional[int] = None, hours: int = 1):
+        """Фильтр статей за последние days дней (или hours часов, если days не задан)"""
+        # Лимит отсчитывается от одного момента на весь запуск
+        batch_now = datetime.datetime.now(datetime.timezone.utc)
+        if days is not None:
+            return lambda date: self._is_article_within_days(date, days, now=batch_now)
+        return lambda date: self._is_article_recent(date, hours, now=batch_now)
 
     async def run_scraping(self) -> None:
         """Основной метод запуска скрапинга с автоматическим определением режима"""
@@ -357,23 +828,19 @@ class FTScraper:
             if is_first:
                 # Первый запуск - собираем статьи за последние 30 дней
                 logger.info("🆕 Первый запуск - собираем статьи за последние 30 дней...")
-                time_filter = lambda date: self._is_article_within_days(date, 30)
-                articles_data = await self.scrape_articles_with_pagination(
+                articles_data, saved_count = await self._scrape_and_save(
                     max_pages=100,
-                    time_filter_func=time_filter
+                    time_filter_func=self._make_time_filter(days=30)
                 )
             else:
                 # Обычный запуск - собираем статьи за последний час
                 logger.info("⏰ Обычный запуск - собираем статьи за последний час...")
-                time_filter = lambda date: self._is_article_recent(date, 1)
-                articles_data = await self.scrape_articles_with_pagination(
+                articles_data, saved_count = await self._scrape_and_save(
                     max_pages=5,  # Максимум 5 страниц для сбора за час
-                    time_filter_func=time_filter
+                    time_filter_func=self._make_time_filter(hours=1)
                 )
 
             if articles_data:
-                # Сохраняем в базу данных
-                saved_count = await self.save_articles_to_db(articles_data)
                 logger.info(f"🎉 Скрапинг завершен! Обработано: {len(articles_data)}, сохранено: {saved_count}")
             else:
                 logger.warning("⚠️ Не удалось получить данные статей")
@@ -382,7 +849,7 @@ class FTScraper:
             logger.error(f"❌ Критическая ошибка скрапинга: {e}")
         finally:
             # Закрываем браузер
-            await self.close_browser()
+            await self._release_browser()
 
     async def run_initial_scraping(self) -> None:
         """Принудительный запуск сбора статей за 30 дней (для первого запуска)"""
@@ -391,21 +858,19 @@ class FTScraper:
 
             await self.init_browser()
 
-            time_filter = lambda date: self._is_article_within_days(date, 30)
-            articles_data = await self.scrape_articles_with_pagination(
+            articles_data, saved_count = await self._scrape_and_save(
                 max_pages=50,
-                time_filter_func=time_filter
+                time_filter_func=self._make_time_filter(days=30)
             )
 
             if articles_data:
-                saved_count = await self.save_articles_to_db(articles_data)
                 logger.info(
                     f"🎉 Принудительный сбор завершен! Обработано: {len(articles_data)}, сохранено: {saved_count}")
 
         except Exception as e:
             logger.error(f"❌ Ошибка принудительного сбора: {e}")
         finally:
-            await self.close_browser()
+            await self._release_browser()
 
     async def run_hourly_scraping(self) -> None:
         """Запуск сбора статей за последний час"""
@@ -414,17 +879,22 @@ class FTScraper:
 
             await self.init_browser()
 
-            time_filter = lambda date: self._is_article_recent(date, 1)
-            articles_data = await self.scrape_articles_with_pagination(
+            articles_data, saved_count = await self._scrape_and_save(
                 max_pages=5,
-                time_filter_func=time_filter
+                time_filter_func=self._make_time_filter(hours=1)
             )
 
             if articles_data:
-                saved_count = await self.save_articles_to_db(articles_data)
                 logger.info(f"🎉 Почасовой сбор завершен! Обработано: {len(articles_data)}, сохранено: {saved_count}")
 
         except Exception as e:
             logger.error(f"❌ Ошибка почасового сбора: {e}")
         finally:
-            await self.close_browser()
+            await self._release_browser()
+
+
+@lru_cache(maxsize=1)
+def get_scraper() -> FTScraper:
+    """Общий на процесс скрапер: браузер запускается один раз и переиспользуется"""
+    # SCRAPER_CONCURRENCY - сколько страниц раздела загружается параллельно (по умолчанию по одной)
+    return FTScraper(concurrency=int(os.getenv("SCRAPER_CONCURRENCY", "1")), reuse_browser=True)
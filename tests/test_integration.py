@@ -3,72 +3,65 @@
 """
 import pytest
 import asyncio
-import datetime
-from unittest.mock import AsyncMock, patch
-from sqlalchemy import select
+import orjson
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import func, select, text
 
+from app.api.app import health_check
 from app.main import main
 from app.scheduler.scheduler import ScrapingScheduler
 from app.scraper.scraper import FTScraper
 from app.models.models import Article
-from app.db.database import init_db
+from app.db.database import HEALTHCHECK, init_db
+
+_SELECT_NUMBER = text("SELECT :n")
+
+# HTML страницы раздела с одной статьей, как его возвращает page.content()
+_MOCK_TEASER_HTML = """
+<html>
+    <ul class="o-teaser-collection__list">
+        <li class="o-teaser-collection__item">
+            <a href="/content/integration-test" class="js-teaser-heading-link">Integration Test Article</a>
+            <a href="/content/integration-test" class="js-teaser-standfirst-link">Integration test content</a>
+            <a href="/author/test" class="o-teaser__tag">Test Author</a>
+            <time title="January 15 2024 10:30 am">Jan 15 2024</time>
+        </li>
+    </ul>
+</html>
+"""
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_database_initialization():
+async def test_database_initialization(patched_engine):
     """Тестирует инициализацию базы данных"""
-    # Мокаем engine и connection
-    with patch('app.db.database.engine') as mock_engine:
-        mock_conn = AsyncMock()
-        mock_engine.begin.return_value.__aenter__.return_value = mock_conn
-        
-        await init_db()
-        
-        mock_engine.begin.assert_called_once()
-        mock_conn.run_sync.assert_called_once()
+    mock_engine, mock_conn = patched_engine
+    
+    await init_db()
+    
+    assert mock_engine.begin_called == 1
+    mock_conn.run_sync.assert_called_once()
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_full_scraping_cycle(test_db_session):
+async def test_full_scraping_cycle(test_db_session, patched_session, mock_playwright):
     """Интеграционный тест полного цикла скрапинга"""
     scraper = FTScraper()
     
     # Мокаем браузер и страницу
     scraper.init_browser = AsyncMock()
     scraper.close_browser = AsyncMock()
-    mock_page = AsyncMock()
+    _, _, _, mock_page = mock_playwright
     scraper.page = mock_page
     
     # Мокаем HTML ответ с одной статьей
-    html_content = """
-    <html>
-        <ul class="o-teaser-collection__list">
-            <li class="o-teaser-collection__item">
-                <a href="/content/integration-test" class="js-teaser-heading-link">Integration Test Article</a>
-                <a href="/content/integration-test" class="js-teaser-standfirst-link">Integration test content</a>
-                <a href="/author/test" class="o-teaser__tag">Test Author</a>
-                <time title="January 15 2024 10:30 am">Jan 15 2024</time>
-            </li>
-        </ul>
-    </html>
-    """
-    
-    mock_page.content.return_value = html_content
-    mock_page.goto = AsyncMock()
-    mock_page.wait_for_selector = AsyncMock()
-    
-    # Мокаем get_session чтобы использовать тестовую сессию
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        mock_get_session.return_value = mock_session_generator()
-        
-        # Мокаем asyncio.sleep для ускорения теста
-        with patch('asyncio.sleep'):
-            articles_data = await scraper.scrape_single_page(1)
-            saved_count = await scraper.save_articles_to_db(articles_data)
+    mock_page.content.return_value = _MOCK_TEASER_HTML
+    
+    # Мокаем asyncio.sleep для ускорения теста
+    with patch('asyncio.sleep'):
+        articles_data = await scraper.scrape_single_page(1)
+        saved_count = await scraper.save_articles_to_db(articles_data)
     
     # Проверяем результаты
     assert len(articles_data) == 1
@@ -109,59 +102,60 @@ async def test_scheduler_scraper_integration():
 @pytest.mark.asyncio
 async def test_main_application_flow():
     """Тестирует основной поток выполнения приложения"""
-    # Мокаем все внешние зависимости
-    with patch('app.main.init_db') as mock_init_db, \
-         patch('app.main.close_db') as mock_close_db, \
-         patch('app.main.ScrapingScheduler') as mock_scheduler_class:
-        
-        mock_scheduler = AsyncMock()
-        mock_scheduler_class.return_value = mock_scheduler
-        
-        # Мокаем scheduler.start чтобы он сразу завершался
-        async def mock_start():
-            # Имитируем KeyboardInterrupt для завершения
-            raise KeyboardInterrupt("Test interrupt")
-        
-        mock_scheduler.start = mock_start
-        
-        # Запускаем main
-        await main()
-        
-        # Проверяем, что были вызваны нужные методы
-        mock_init_db.assert_called_once()
-        mock_scheduler_class.assert_called_once()
-        mock_close_db.assert_called_once()
+    # Передаем зависимости напрямую, без патчинга модуля
+    mock_init_db = AsyncMock()
+    mock_close_db = AsyncMock()
+    mock_run_api = AsyncMock()
+    mock_scheduler = AsyncMock()
+    mock_scheduler_class = MagicMock(return_value=mock_scheduler)
+    
+    await main(
+        init_db=mock_init_db,
+        close_db=mock_close_db,
+        scheduler_cls=mock_scheduler_class,
+        run_api=mock_run_api
+    )
+    
+    # Проверяем, что были вызваны нужные методы
+    mock_init_db.assert_called_once()
+    mock_scheduler_class.assert_called_once()
+    mock_scheduler.start.assert_called_once()
+    mock_run_api.assert_called_once()
+    mock_close_db.assert_called_once()
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_main_application_with_exception():
     """Тестирует обработку исключений в основном потоке"""
-    with patch('app.main.init_db') as mock_init_db, \
-         patch('app.main.close_db') as mock_close_db:
-        
-        # init_db выбрасывает исключение
-        mock_init_db.side_effect = Exception("Database init failed")
-        
-        # Не должно выбрасывать исключение
-        await main()
-        
-        # close_db должен быть вызван даже при ошибке
-        mock_close_db.assert_called_once()
+    # init_db выбрасывает исключение
+    mock_init_db = AsyncMock(side_effect=Exception("Database init failed"))
+    mock_close_db = AsyncMock()
+    mock_run_api = AsyncMock()
+    
+    # Не должно выбрасывать исключение
+    await main(init_db=mock_init_db, close_db=mock_close_db, run_api=mock_run_api)
+    
+    # close_db должен быть вызван даже при ошибке
+    mock_close_db.assert_called_once()
+    mock_run_api.assert_not_called()
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_complete_first_run_scenario(test_db_session):
-    """Тестирует сценарий первого запуска приложения"""
-    # Проверяем, что база пустая (первый запуск)
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        mock_get_session.return_value = mock_session_generator()
-        
-        is_first = await FTScraper.is_first_run()
-        assert is_first is True
+@pytest.mark.parametrize("has_articles, run_method, expected_max_pages", [
+    (False, "run_initial_scraping", 50),  # Первый запуск: пустая база
+    (True, "run_hourly_scraping", 5),  # Обычный запуск: в базе уже есть статьи
+], ids=["first_run", "normal_run"])
+async def test_complete_run_scenario(seed_articles, patched_session, queued_pagination, make_article_row,
+                                     has_articles, run_method, expected_max_pages):
+    """Тестирует сценарии первого и обычного запуска приложения"""
+    if has_articles:
+        await seed_articles([make_article_row("https://existing.com/article", "Existing Article")])
+    
+    # Режим запуска определяется наличием статей в базе
+    is_first = await FTScraper.is_first_run()
+    assert is_first is not has_articles
     
     # Создаем планировщик и скрапер
     scheduler = ScrapingScheduler()
@@ -169,68 +163,18 @@ async def test_complete_first_run_scenario(test_db_session):
     scheduler.scraper.close_browser = AsyncMock()
     
     # Мокаем скрапинг
-    mock_articles = [
-        {
-            "url": "https://test.com/first-run-article",
-            "title": "First Run Article",
-            "content": "Content from first run",
-            "author": "Test Author",
-            "published_at": datetime.datetime.now(datetime.timezone.utc),
-            "scraped_at": datetime.datetime.now(datetime.timezone.utc)
-        }
-    ]
-    
-    scheduler.scraper.scrape_articles_with_pagination = AsyncMock(return_value=mock_articles)
+    mock_articles = [make_article_row("https://test.com/scenario-article", "Scenario Article")]
+    scheduler.scraper.scrape_articles_with_pagination = queued_pagination(mock_articles)
     
-    # Мокаем сохранение в базу
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        mock_get_session.return_value = mock_session_generator()
-        
-        # Запускаем первоначальный скрапинг
-        await scheduler.scraper.run_initial_scraping()
+    await getattr(scheduler.scraper, run_method)()
     
-    # Проверяем, что скрапинг был выполнен с правильными параметрами
+    # Проверяем, что скрапинг был выполнен с параметрами своего режима
     scheduler.scraper.scrape_articles_with_pagination.assert_called_once()
     args, kwargs = scheduler.scraper.scrape_articles_with_pagination.call_args
-    assert kwargs['max_pages'] == 50  # Для первого запуска
-
-
-@pytest.mark.integration
-@pytest.mark.asyncio
-async def test_complete_normal_run_scenario(test_db_session):
-    """Тестирует сценарий обычного запуска приложения"""
-    # Добавляем статью в базу (НЕ первый запуск)
-    article = Article(
-        url="https://existing.com/article",
-        title="Existing Article",
-        content="Existing content",
-        published_at=datetime.datetime.now(datetime.timezone.utc),
-        scraped_at=datetime.datetime.now(datetime.timezone.utc)
-    )
-    test_db_session.add(article)
-    await test_db_session.commit()
-    
-    # Проверяем, что это НЕ первый запуск
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        mock_get_session.return_value = mock_session_generator()
-        
-        is_first = await FTScraper.is_first_run()
-        assert is_first is False
-    
-    # Создаем планировщик
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.init_browser = AsyncMock()
-    scheduler.scraper.close_browser = AsyncMock()
-    scheduler.scraper.scrape_articles_with_pagination = AsyncMock(return_value=[])
-    
-    # Запускаем почасовой скрапинг
-    await scheduler.scraper.run_hourly_scraping()
+    assert kwargs['max_pages'] == expected_max_pages
     
-    # Проверяем параметры для почасового скрапинга
-    args, kwargs = scheduler.scraper.scrape_articles_with_pagination.call_args
-    assert kwargs['max_pages'] == 5  # Для почасового запуска
+    # Собранная статья сохранена в базу
+    assert await patched_session.scalar(select(func.count()).select_from(Article)) == 1 + has_articles
 
 
 @pytest.mark.integration
@@ -288,48 +232,78 @@ async def test_concurrent_scraping_operations():
     scraper2.scrape_single_page.assert_called_once_with(2)
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_concurrent_scraping_sessions(isolated_sessionmaker, make_article_row):
+    """Тестирует параллельное сохранение статей из независимых сессий"""
+    def make_articles(prefix):
+        return [
+            make_article_row(url, f"Article {url}")
+            for url in (f"https://test.com/{prefix}-1", f"https://test.com/{prefix}-2", "https://test.com/shared")
+        ]
+
+    # Каждый вызов get_session открывает собственную сессию, как в продакшене
+    async def mock_get_session():
+        async with isolated_sessionmaker() as session:
+            yield session
+
+    with patch('app.scraper.scraper.get_session', mock_get_session):
+        results = await asyncio.gather(
+            *(FTScraper.save_articles_to_db(make_articles(prefix)) for prefix in ("a", "b", "c"))
+        )
+
+    # Общая статья сохраняется только одной из задач
+    assert sum(results) == 7
+
+    async with isolated_sessionmaker() as session:
+        assert await session.scalar(select(func.count()).select_from(Article)) == 7
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_database_connection_pool(test_db_session):
     """Тестирует работу пула подключений к базе данных"""
-    from sqlalchemy import text
-    
     # Используем тестовую сессию для проверки базовой функциональности
-    result = await test_db_session.execute(text("SELECT 1"))
+    result = await test_db_session.execute(HEALTHCHECK)
     assert result.scalar() == 1
     
-    # Проверяем, что можем выполнить несколько запросов
+    # Проверяем, что можем выполнить несколько запросов одним параметризованным выражением
     for i in range(3):
-        result = await test_db_session.execute(text(f"SELECT {i + 1}"))
+        result = await test_db_session.execute(_SELECT_NUMBER, {"n": i + 1})
         assert result.scalar() == i + 1
 
 
-@pytest.mark.integration
-@pytest.mark.asyncio
-async def test_logging_integration():
-    """Тестирует интеграцию логирования"""
-    # Проверяем, что логгер настроен в main.py
-    import app.main
-    from loguru import logger
-    
-    # Логгер должен быть настроен для записи в файл
-    # Это проверяется косвенно через успешный импорт модуля
-    assert hasattr(logger, 'info')
-    assert hasattr(logger, 'error')
-    assert hasattr(logger, 'warning')
-
-
 @pytest.mark.integration
 @pytest.mark.asyncio  
-async def test_environment_configuration():
+async def test_environment_configuration(fresh_database_url):
     """Тестирует конфигурацию через переменные окружения"""
     import os
     
     # Проверяем, что переменные окружения правильно обрабатываются
     with patch.dict(os.environ, {'DATABASE_URL': 'sqlite+aiosqlite:///:memory:'}):
-        # Перезагружаем модуль для применения новых переменных
-        import importlib
-        import app.db.database
-        importlib.reload(app.db.database)
-        
-        assert app.db.database.DATABASE_URL == 'sqlite+aiosqlite:///:memory:'
\ No newline at end of file
+        assert fresh_database_url() == 'sqlite+aiosqlite:///:memory:'
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_health_check_database_available(test_db_session):
+    """Тестирует проверку здоровья при доступной базе данных"""
+    response = await health_check(db=test_db_session)
+
+    assert response.status_code == 200
+    assert orjson.loads(response.body)["database"] == "ok"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_health_check_database_unavailable():
+    """Тестирует проверку здоровья, когда база данных не отвечает"""
+    db = AsyncMock()
+    db.execute.side_effect = ConnectionRefusedError("connection refused")
+
+    response = await health_check(db=db)
+
+    assert response.status_code == 503
+    body = orjson.loads(response.body)
+    assert body["status"] == "unhealthy"
+    assert body["database"] == "unavailable"
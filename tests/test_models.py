@@ -3,21 +3,29 @@
 """
 import pytest
 import datetime
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from app.models.models import Article, Base
 
+# Одно время на весь модуль: тестам не нужны разные значения времени
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_article_model_creation(test_db_session):
+@pytest.mark.parametrize("url, author", [
+    ("https://www.ft.com/content/test-123", "Test Author"),
+    ("https://www.ft.com/content/no-author-test", None),  # Поле author может быть пустым
+], ids=["basic", "no_author"])
+async def test_article_model_creation(test_db_session, url, author):
     """Тестирует создание модели Article"""
     article_data = {
-        "url": "https://www.ft.com/content/test-123",
+        "url": url,
         "title": "Test Article",
         "content": "Test content for the article",
-        "author": "Test Author",
-        "published_at": datetime.datetime.now(datetime.timezone.utc),
-        "scraped_at": datetime.datetime.now(datetime.timezone.utc)
+        "author": author,
+        "published_at": NOW,
+        "scraped_at": NOW
     }
     
     article = Article(**article_data)
@@ -28,6 +36,7 @@ async def test_article_model_creation(test_db_session):
     result = await test_db_session.execute(select(Article).where(Article.url == article_data["url"]))
     saved_article = result.scalar_one()
     
+    assert saved_article.id is not None
     assert saved_article.url == article_data["url"]
     assert saved_article.title == article_data["title"]
     assert saved_article.content == article_data["content"]
@@ -45,8 +54,8 @@ async def test_article_unique_constraint(test_db_session):
         "title": "First Article",
         "content": "First content",
         "author": "Author One",
-        "published_at": datetime.datetime.now(datetime.timezone.utc),
-        "scraped_at": datetime.datetime.now(datetime.timezone.utc)
+        "published_at": NOW,
+        "scraped_at": NOW
     }
     
     # Создаем первую статью
@@ -59,35 +68,16 @@ async def test_article_unique_constraint(test_db_session):
     article_data["content"] = "Second content"
     
     article2 = Article(**article_data)
-    test_db_session.add(article2)
     
-    # Должно возникнуть исключение из-за уникального ограничения
-    with pytest.raises(Exception):  # IntegrityError
-        await test_db_session.commit()
-
-
-@pytest.mark.unit
-@pytest.mark.asyncio
-async def test_article_optional_author(test_db_session):
-    """Тестирует, что поле author может быть пустым"""
-    article_data = {
-        "url": "https://www.ft.com/content/no-author-test",
-        "title": "Article without author",
-        "content": "Content without author",
-        "author": None,
-        "published_at": datetime.datetime.now(datetime.timezone.utc),
-        "scraped_at": datetime.datetime.now(datetime.timezone.utc)
-    }
+    # Должно возникнуть исключение из-за уникального ограничения;
+    # откатывается только SAVEPOINT, транзакция теста остается рабочей
+    with pytest.raises(IntegrityError):
+        async with test_db_session.begin_nested():
+            test_db_session.add(article2)
+            await test_db_session.flush()
     
-    article = Article(**article_data)
-    test_db_session.add(article)
-    await test_db_session.commit()
-    
-    # Проверяем, что статья создана с author = None
-    result = await test_db_session.execute(select(Article).where(Article.url == article_data["url"]))
-    saved_article = result.scalar_one()
-    
-    assert saved_article.author is None
+    # Первая статья на месте, сессия пригодна для дальнейшей работы
+    assert await test_db_session.scalar(select(func.count()).select_from(Article)) == 1
 
 
 @pytest.mark.unit
@@ -95,15 +85,16 @@ async def test_article_optional_author(test_db_session):
 async def test_article_required_fields(test_db_session):
     """Тестирует, что обязательные поля не могут быть пустыми"""
     # Тестируем отсутствие URL
-    with pytest.raises(Exception):
-        article = Article(
-            title="Test",
-            content="Test content",
-            published_at=datetime.datetime.now(datetime.timezone.utc),
-            scraped_at=datetime.datetime.now(datetime.timezone.utc)
-        )
-        test_db_session.add(article)
-        await test_db_session.commit()
+    article = Article(
+        title="Test",
+        content="Test content",
+        published_at=NOW,
+        scraped_at=NOW
+    )
+    with pytest.raises(IntegrityError):
+        async with test_db_session.begin_nested():
+            test_db_session.add(article)
+            await test_db_session.flush()
 
 
 @pytest.mark.unit
@@ -122,8 +113,8 @@ def test_article_string_length_constraints():
         "url": long_url,
         "title": "Test",
         "content": "Test content",
-        "published_at": datetime.datetime.now(datetime.timezone.utc),
-        "scraped_at": datetime.datetime.now(datetime.timezone.utc)
+        "published_at": NOW,
+        "scraped_at": NOW
     }
     
     # Должно работать если URL не превышает 1024 символа
@@ -133,7 +124,7 @@ def test_article_string_length_constraints():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_multiple_articles_creation(test_db_session):
+async def test_multiple_articles_creation(test_db_session, seed_articles):
     """Тестирует создание нескольких статей"""
     articles_data = [
         {
@@ -141,27 +132,20 @@ async def test_multiple_articles_creation(test_db_session):
             "title": f"Test Article {i}",
             "content": f"Test content {i}",
             "author": f"Author {i}",
-            "published_at": datetime.datetime.now(datetime.timezone.utc),
-            "scraped_at": datetime.datetime.now(datetime.timezone.utc)
+            "published_at": NOW,
+            "scraped_at": NOW
         }
         for i in range(3)
     ]
     
-    # Добавляем все статьи
-    for article_data in articles_data:
-        article = Article(**article_data)
-        test_db_session.add(article)
-    
-    await test_db_session.commit()
+    # Добавляем все статьи одним INSERT
+    await seed_articles(articles_data)
     
     # Проверяем, что все статьи созданы
-    result = await test_db_session.execute(select(Article))
-    all_articles = result.scalars().all()
-    
-    assert len(all_articles) == 3
+    assert await test_db_session.scalar(select(func.count()).select_from(Article)) == 3
     
     # Проверяем, что все URL уникальны
-    urls = [article.url for article in all_articles]
+    urls = (await test_db_session.scalars(select(Article.url))).all()
     assert len(set(urls)) == 3
 
 
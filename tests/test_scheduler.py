@@ -1,10 +1,11 @@
 """
 Тесты для планировщика задач
 """
-import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch, MagicMock
-from app.scheduler.scheduler import ScrapingScheduler
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.scheduler.scheduler import JOB_DEFAULTS, ScrapingScheduler
+from app.scraper.scraper import FTScraper, get_scraper
 
 
 @pytest.mark.unit
@@ -14,229 +15,179 @@ def test_scheduler_initialization():
     
     assert scheduler.scheduler is not None
     assert scheduler.scraper is not None
+    assert scheduler.scraper.reuse_browser is True
     assert hasattr(scheduler.scheduler, 'add_job')
     assert hasattr(scheduler.scheduler, 'start')
     assert hasattr(scheduler.scheduler, 'shutdown')
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
-async def test_initial_scrape_job():
-    """Тестирует задачу первоначального скрапинга"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_initial_scraping = AsyncMock()
-    
-    await scheduler.initial_scrape_job()
-    
-    scheduler.scraper.run_initial_scraping.assert_called_once()
+def test_schedulers_share_scraper():
+    """Тестирует, что планировщики используют общий скрапер процесса"""
+    scheduler1 = ScrapingScheduler()
+    scheduler2 = ScrapingScheduler()
 
-
-@pytest.mark.unit
-@pytest.mark.asyncio
-async def test_initial_scrape_job_with_exception():
-    """Тестирует обработку исключений в задаче первоначального скрапинга"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_initial_scraping = AsyncMock(side_effect=Exception("Test error"))
-    
-    # Не должно выбрасывать исключение
-    await scheduler.initial_scrape_job()
-    
-    scheduler.scraper.run_initial_scraping.assert_called_once()
+    assert scheduler1.scraper is scheduler2.scraper
+    assert scheduler1.scraper is get_scraper()
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
-async def test_hourly_scrape_job():
-    """Тестирует почасовую задачу скрапинга"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_hourly_scraping = AsyncMock()
-    
-    await scheduler.hourly_scrape_job()
-    
-    scheduler.scraper.run_hourly_scraping.assert_called_once()
+def test_scheduler_with_custom_scraper():
+    """Тестирует передачу собственного скрапера в планировщик"""
+    scraper = FTScraper()
+
+    assert ScrapingScheduler(scraper).scraper is scraper
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
-async def test_hourly_scrape_job_with_exception():
-    """Тестирует обработку исключений в почасовой задаче"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_hourly_scraping = AsyncMock(side_effect=Exception("Test error"))
-    
-    # Не должно выбрасывать исключение
-    await scheduler.hourly_scrape_job()
+def test_scheduler_job_defaults():
+    """Тестирует, что планировщик создается с параметрами задач по умолчанию"""
+    with patch('app.scheduler.scheduler.AsyncIOScheduler') as mock_scheduler_class, \
+         patch('app.scheduler.scheduler.get_scraper'):
+        ScrapingScheduler()
     
-    scheduler.scraper.run_hourly_scraping.assert_called_once()
+    mock_scheduler_class.assert_called_once_with(job_defaults=JOB_DEFAULTS)
+    assert JOB_DEFAULTS['coalesce'] is True
+    assert JOB_DEFAULTS['max_instances'] == 1
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_adaptive_scrape_job():
-    """Тестирует адаптивную задачу скрапинга"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_scraping = AsyncMock()
+@pytest.mark.parametrize("job_name, scraper_method", [
+    ("initial_scrape_job", "run_initial_scraping"),
+    ("hourly_scrape_job", "run_hourly_scraping"),
+    ("adaptive_scrape_job", "run_scraping"),
+    ("start_manual_mode", "run_scraping"),
+], ids=["initial", "hourly", "adaptive", "manual"])
+@pytest.mark.parametrize("error", [None, Exception("Test error")], ids=["ok", "with_exception"])
+async def test_scrape_job(scheduler, job_name, scraper_method, error):
+    """Тестирует задачи скрапинга: вызывают нужный метод скрапера и не пробрасывают исключения"""
+    setattr(scheduler.scraper, scraper_method, AsyncMock(side_effect=error))
     
-    await scheduler.adaptive_scrape_job()
+    # Не должно выбрасывать исключение
+    await getattr(scheduler, job_name)()
     
-    scheduler.scraper.run_scraping.assert_called_once()
+    getattr(scheduler.scraper, scraper_method).assert_awaited_once()
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_adaptive_scrape_job_with_exception():
-    """Тестирует обработку исключений в адаптивной задаче"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_scraping = AsyncMock(side_effect=Exception("Test error"))
+async def test_stop(scheduler):
+    """Тестирует остановку планировщика"""
+    scheduler.scheduler.running = True
     
-    # Не должно выбрасывать исключение
-    await scheduler.adaptive_scrape_job()
+    await scheduler.stop()
     
-    scheduler.scraper.run_scraping.assert_called_once()
+    scheduler.scheduler.shutdown.assert_called_once()
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_start_manual_mode():
-    """Тестирует запуск в ручном режиме"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_scraping = AsyncMock()
+async def test_stop_not_running(scheduler):
+    """Тестирует остановку планировщика когда он не запущен"""
+    scheduler.scheduler.running = False
     
-    await scheduler.start_manual_mode()
+    await scheduler.stop()
     
-    scheduler.scraper.run_scraping.assert_called_once()
+    # shutdown не должен быть вызван если планировщик не запущен
+    scheduler.scheduler.shutdown.assert_not_called()
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_start_manual_mode_with_exception():
-    """Тестирует обработку исключений в ручном режиме"""
-    scheduler = ScrapingScheduler()
-    scheduler.scraper.run_scraping = AsyncMock(side_effect=Exception("Test error"))
+async def test_stop_with_exception(scheduler):
+    """Тестирует обработку исключений при остановке планировщика"""
+    scheduler.scheduler.running = True
+    scheduler.scheduler.shutdown.side_effect = Exception("Shutdown error")
     
     # Не должно выбрасывать исключение
-    await scheduler.start_manual_mode()
+    await scheduler.stop()
     
-    scheduler.scraper.run_scraping.assert_called_once()
+    scheduler.scheduler.shutdown.assert_called_once()
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_stop():
-    """Тестирует остановку планировщика"""
-    scheduler = ScrapingScheduler()
-    with patch.object(scheduler.scheduler, 'running', True):
-        scheduler.scheduler.shutdown = MagicMock()
-        
-        await scheduler.stop()
-        
-        scheduler.scheduler.shutdown.assert_called_once()
-
+async def test_stop_closes_browser_once(scheduler):
+    """Тестирует, что браузер закрывается при остановке, а не после каждой задачи"""
+    scheduler.scheduler.running = True
 
-@pytest.mark.unit
-@pytest.mark.asyncio
-async def test_stop_not_running():
-    """Тестирует остановку планировщика когда он не запущен"""
-    scheduler = ScrapingScheduler()
-    with patch.object(scheduler.scheduler, 'running', False):
-        scheduler.scheduler.shutdown = MagicMock()
-        
-        await scheduler.stop()
-        
-        # shutdown не должен быть вызван если планировщик не запущен
-        scheduler.scheduler.shutdown.assert_not_called()
+    await scheduler.hourly_scrape_job()
+    await scheduler.hourly_scrape_job()
+    scheduler.scraper.close_browser.assert_not_awaited()
 
+    await scheduler.stop()
 
-@pytest.mark.unit
-@pytest.mark.asyncio
-async def test_stop_with_exception():
-    """Тестирует обработку исключений при остановке планировщика"""
-    scheduler = ScrapingScheduler()
-    with patch.object(scheduler.scheduler, 'running', True):
-        scheduler.scheduler.shutdown = MagicMock(side_effect=Exception("Shutdown error"))
-        
-        # Не должно выбрасывать исключение
-        await scheduler.stop()
-        
-        scheduler.scheduler.shutdown.assert_called_once()
+    scheduler.scraper.close_browser.assert_awaited_once()
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_start_first_run():
+async def test_start_first_run(scheduler):
     """Интеграционный тест первого запуска планировщика"""
-    scheduler = ScrapingScheduler()
-    
     # Мокаем методы
     scheduler.scraper.is_first_run = AsyncMock(return_value=True)
     scheduler.scraper.run_initial_scraping = AsyncMock()
-    scheduler.scheduler.add_job = MagicMock()
-    scheduler.scheduler.start = MagicMock()
     
-    # Мокаем asyncio.sleep чтобы не ждать
-    original_sleep = asyncio.sleep
-    sleep_count = 0
+    # Сигнал остановки вместо ожидания
+    mock_wait = AsyncMock(side_effect=KeyboardInterrupt())
     
-    async def mock_sleep(_duration):
-        nonlocal sleep_count
-        sleep_count += 1
-        if sleep_count > 2:  # Прерываем после нескольких итераций
-            raise KeyboardInterrupt("Test interrupt")
-        await original_sleep(0.01)  # Короткая пауза
-    
-    with patch('asyncio.sleep', side_effect=mock_sleep):
-        try:
-            await scheduler.start()
-        except KeyboardInterrupt:
-            pass  # Ожидаемое исключение для завершения теста
+    with patch.object(scheduler._stop_event, 'wait', new=mock_wait):
+        await scheduler.start()
     
     # Проверяем, что были вызваны нужные методы
-    scheduler.scraper.is_first_run.assert_called_once()
-    scheduler.scraper.run_initial_scraping.assert_called_once()
+    scheduler.scraper.is_first_run.assert_awaited_once()
+    scheduler.scraper.run_initial_scraping.assert_awaited_once()
     scheduler.scheduler.add_job.assert_called_once()
     scheduler.scheduler.start.assert_called_once()
+    mock_wait.assert_awaited_once()
+    assert scheduler._stop_event.is_set()
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_start_normal_run():
+async def test_start_normal_run(scheduler):
     """Интеграционный тест обычного запуска планировщика"""
-    scheduler = ScrapingScheduler()
-    
     # Мокаем методы
     scheduler.scraper.is_first_run = AsyncMock(return_value=False)
     scheduler.adaptive_scrape_job = AsyncMock()
-    scheduler.scheduler.add_job = MagicMock()
-    scheduler.scheduler.start = MagicMock()
-    
-    # Мокаем asyncio.sleep чтобы не ждать
-    sleep_count = 0
     
-    async def mock_sleep(_duration):
-        nonlocal sleep_count
-        sleep_count += 1
-        if sleep_count > 2:  # Прерываем после нескольких итераций
-            raise KeyboardInterrupt("Test interrupt")
-        await asyncio.sleep(0.01)  # Короткая пауза
+    # Сигнал остановки вместо ожидания
+    mock_wait = AsyncMock(side_effect=KeyboardInterrupt())
     
-    with patch('asyncio.sleep', side_effect=mock_sleep):
-        try:
-            await scheduler.start()
-        except KeyboardInterrupt:
-            pass  # Ожидаемое исключение для завершения теста
+    with patch.object(scheduler._stop_event, 'wait', new=mock_wait):
+        await scheduler.start()
     
     # Проверяем, что были вызваны нужные методы
-    scheduler.scraper.is_first_run.assert_called_once()
-    scheduler.adaptive_scrape_job.assert_called_once()
+    scheduler.scraper.is_first_run.assert_awaited_once()
+    scheduler.adaptive_scrape_job.assert_awaited_once()
     scheduler.scheduler.add_job.assert_called_once()
     scheduler.scheduler.start.assert_called_once()
+    mock_wait.assert_awaited_once()
+    assert scheduler._stop_event.is_set()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_start_returns_after_stop(scheduler):
+    """Тестирует, что start() завершается после вызова stop() из другой задачи"""
+    scheduler.scraper.is_first_run = AsyncMock(return_value=False)
+    scheduler.adaptive_scrape_job = AsyncMock()
+
+    start_task = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0)
+    assert not start_task.done()
+
+    await scheduler.stop()
+    await asyncio.wait_for(start_task, timeout=1)
+
+    scheduler.scraper.close_browser.assert_awaited_once()
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_start_with_exception():
+async def test_start_with_exception(scheduler):
     """Тестирует обработку исключений при запуске планировщика"""
-    scheduler = ScrapingScheduler()
-    
     # Мокаем методы так чтобы is_first_run выбрасывал исключение
     scheduler.scraper.is_first_run = AsyncMock(side_effect=Exception("Test error"))
     scheduler.stop = AsyncMock()
@@ -244,26 +195,17 @@ async def test_start_with_exception():
     await scheduler.start()
     
     # Проверяем, что метод stop был вызван при исключении
-    scheduler.stop.assert_called_once()
+    scheduler.stop.assert_awaited_once()
 
 
 @pytest.mark.unit
-def test_scheduler_job_configuration():
+def test_scheduler_job_configuration(scheduler):
     """Тестирует конфигурацию задач планировщика"""
     from apscheduler.triggers.interval import IntervalTrigger
     
-    scheduler = ScrapingScheduler()
-    mock_add_job = MagicMock()
-    scheduler.scheduler.add_job = mock_add_job
+    mock_add_job = scheduler.scheduler.add_job
     
-    # Имитируем добавление задачи как в реальном коде
-    scheduler.scheduler.add_job(
-        scheduler.hourly_scrape_job,
-        trigger=IntervalTrigger(hours=1),
-        id='hourly_scraping_job',
-        name='FT Hourly Scraping',
-        replace_existing=True
-    )
+    scheduler._schedule_hourly_job()
     
     # Проверяем, что add_job был вызван с правильными параметрами
     mock_add_job.assert_called_once()
@@ -1,14 +1,53 @@
 """
 Тесты для скрапера Financial Times
 """
+import asyncio
 import pytest
 import datetime
-from unittest.mock import AsyncMock, patch
-from bs4 import BeautifulSoup
+import inspect
+import os
+import re
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from bs4 import BeautifulSoup, SoupStrainer
+from freezegun import freeze_time
+import lxml.html
 
-from app.scraper.scraper import FTScraper
+from app.scraper.scraper import (
+    FTScraper, ARTICLE_LIST_CSS, COPY_THRESHOLD, FT_BASE_URL,
+    _block_unneeded_resources, _parse_publish_date_cached, _to_absolute_url, get_scraper
+)
+from app.scraper import _patches
+from app.scraper._patches import _fast_stack, apply_playwright_patches
 from app.models.models import Article
-from sqlalchemy import select
+from sqlalchemy import func, select
+
+# Момент, на котором замораживаются часы в тестах, зависящих от текущего времени
+FROZEN_NOW = datetime.datetime(2024, 6, 15, 12, 0, tzinfo=datetime.timezone.utc)
+
+# Тизеры разбираются C-парсером lxml, в дерево попадают только элементы статей
+TEASER_STRAINER = SoupStrainer('li', class_=re.compile(r'(?:^|\s)o-teaser-collection__item(?:\s|$)'))
+
+
+def _extract_article_data_bs4(scraper, article_element, scraped_at=None):
+    """Эталонное извлечение данных статьи из элемента BeautifulSoup для сверки с lxml"""
+    if article_element.select_one('span.o-labels--premium'):
+        return None
+    author_element = article_element.select_one('a.o-teaser__tag')
+    title_element = article_element.select_one('a.js-teaser-heading-link')
+    if not title_element:
+        return None
+    standfirst_element = article_element.select_one('a.js-teaser-standfirst-link')
+    time_element = article_element.select_one('time')
+    return scraper._build_article_data(
+        title_element.get_text(strip=True),
+        title_element.get('href'),
+        standfirst_element.get_text(strip=True) if standfirst_element else "",
+        author_element.get_text(strip=True) if author_element else "Unknown",
+        time_element.get('title') if time_element else None,
+        None,
+        scraped_at
+    )
 
 
 @pytest.mark.unit
@@ -22,31 +61,143 @@ def test_scraper_initialization():
     assert scraper.page is None
 
 
+@pytest.mark.unit
+def test_fast_stack_matches_inspect_stack():
+    """Тестирует, что облегченный стек дает Playwright ту же информацию, что и inspect.stack()"""
+    from playwright._impl._connection import _extract_stack_trace_information_from_stack
+    
+    # Оба стека снимаются в одной строке, чтобы номера строк совпадали
+    real_stack, fast_stack = inspect.stack(0), _fast_stack()
+    
+    assert _extract_stack_trace_information_from_stack(fast_stack, False) == \
+        _extract_stack_trace_information_from_stack(real_stack, False)
+
+
+@pytest.fixture
+def playwright_patch_state(monkeypatch):
+    """Сохраняет модули Playwright и флаг патча, чтобы тест мог их изменить"""
+    from playwright._impl import _connection, _network
+
+    monkeypatch.setattr(_patches, "_applied", False)
+    for module in (_connection, _network):
+        monkeypatch.setattr(module, "inspect", module.inspect)
+    return _connection, _network
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("flag", [None, "0"])
+def test_playwright_patches_opt_in(playwright_patch_state, monkeypatch, flag):
+    """Тестирует, что без PW_FAST_STACK=1 модули Playwright не трогаются"""
+    if flag is None:
+        monkeypatch.delenv("PW_FAST_STACK", raising=False)
+    else:
+        monkeypatch.setenv("PW_FAST_STACK", flag)
+
+    assert apply_playwright_patches() is False
+    assert all(module.inspect is inspect for module in playwright_patch_state)
+
+
+@pytest.mark.unit
+def test_playwright_patches_applied(playwright_patch_state, monkeypatch):
+    """Тестирует применение патча при PW_FAST_STACK=1"""
+    monkeypatch.setenv("PW_FAST_STACK", "1")
+
+    assert apply_playwright_patches() is True
+    assert all(module.inspect.stack is _fast_stack for module in playwright_patch_state)
+    # Повторный вызов из init_browser ничего не меняет
+    assert apply_playwright_patches() is True
+
+
+@pytest.mark.unit
+def test_playwright_patches_skipped_on_missing_module(playwright_patch_state, monkeypatch):
+    """Тестирует, что без ожидаемых модулей Playwright патч пропускается, а не ломает импорт"""
+    monkeypatch.setenv("PW_FAST_STACK", "1")
+    monkeypatch.delattr(playwright_patch_state[1], "inspect")
+
+    assert apply_playwright_patches() is False
+    assert playwright_patch_state[0].inspect is inspect
+    assert _patches._applied is False
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_init_browser_success():
+async def test_init_browser_success(patched_async_playwright):
     """Тестирует успешную инициализацию браузера"""
+    playwright_mock, browser_mock, context_mock, page_mock = patched_async_playwright
     scraper = FTScraper()
     
-    with patch('app.scraper.scraper.async_playwright') as mock_playwright:
-        mock_playwright_instance = AsyncMock()
-        mock_playwright.return_value.start = AsyncMock(return_value=mock_playwright_instance)
-        
-        mock_browser = AsyncMock()
-        mock_context = AsyncMock()
-        mock_page = AsyncMock()
-        
-        mock_playwright_instance.chromium.launch = AsyncMock(return_value=mock_browser)
-        mock_browser.new_context = AsyncMock(return_value=mock_context)
-        mock_context.new_page = AsyncMock(return_value=mock_page)
-        
-        await scraper.init_browser()
-        
-        assert scraper.browser == mock_browser
-        assert scraper.page == mock_page
-        mock_browser.new_context.assert_called_once()
-        mock_context.set_default_timeout.assert_called_with(30000)
-        mock_context.set_default_navigation_timeout.assert_called_with(30000)
+    await scraper.init_browser()
+    
+    assert scraper.browser == browser_mock
+    assert scraper.context == context_mock
+    assert scraper.page == page_mock
+    browser_mock.new_context.assert_called_once()
+    context_mock.set_default_timeout.assert_called_with(30000)
+    context_mock.set_default_navigation_timeout.assert_called_with(30000)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_browser_blocks_resources(patched_async_playwright):
+    """Тестирует, что обработчик, отменяющий лишние ресурсы, устанавливается на весь контекст"""
+    playwright_mock, browser_mock, context_mock, page_mock = patched_async_playwright
+    scraper = FTScraper(concurrency=2)
+
+    await scraper.init_browser()
+
+    context_mock.route.assert_awaited_once_with("**/*", _block_unneeded_resources)
+    page_mock.route.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resource_type, blocked", [
+    ("image", True),
+    ("font", True),
+    ("media", True),
+    ("stylesheet", True),
+    ("document", False),
+    ("script", False),
+    ("xhr", False),
+])
+async def test_block_unneeded_resources(resource_type, blocked):
+    """Тестирует, какие типы ресурсов отменяются обработчиком запросов"""
+    route = AsyncMock()
+    route.request.resource_type = resource_type
+
+    await _block_unneeded_resources(route)
+
+    assert route.abort.await_count == int(blocked)
+    assert route.continue_.await_count == int(not blocked)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_browser_page_pool_reused(patched_async_playwright):
+    """Тестирует, что пул вкладок создается при запуске браузера и переиспользуется страницами пагинации"""
+    playwright_mock, browser_mock, context_mock, page_mock = patched_async_playwright
+    pool_pages = [AsyncMock(name=f"page{i}") for i in range(4)]
+    context_mock.new_page.side_effect = pool_pages
+    scraper = FTScraper(concurrency=4)
+
+    await scraper.init_browser()
+
+    assert context_mock.new_page.await_count == 4
+    assert scraper._page_pool.qsize() == 4
+
+    used_pages = []
+
+    async def mock_scrape_single_page(page_num, time_filter_func=None, page=None):
+        used_pages.append(page)
+        return []
+
+    scraper.scrape_single_page = mock_scrape_single_page
+    await asyncio.gather(*(scraper._scrape_page_from_pool(num) for num in range(1, 13)))
+
+    # Новые вкладки не создаются, все вкладки возвращены в пул
+    assert context_mock.new_page.await_count == 4
+    assert set(used_pages) <= set(pool_pages)
+    assert scraper._page_pool.qsize() == 4
 
 
 @pytest.mark.unit
@@ -70,6 +221,30 @@ async def test_init_browser_retry_on_failure():
                 await scraper.init_browser(max_retries=3)
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_browser_retry_reuses_playwright(patched_async_playwright):
+    """Тестирует, что повторные попытки запуска браузера используют один драйвер Playwright"""
+    playwright_mock, browser_mock, context_mock, page_mock = patched_async_playwright
+    playwright_mock.chromium.launch.side_effect = [Exception("Launch failed"), browser_mock]
+    scraper = FTScraper()
+
+    with patch('asyncio.sleep'):
+        await scraper.init_browser(max_retries=3)
+
+    assert playwright_mock.chromium.launch.await_count == 2
+    assert scraper._playwright is playwright_mock
+    assert scraper.browser is browser_mock
+
+    # Перезапуск отключившегося браузера тоже не поднимает новый драйвер
+    browser_mock.is_connected.return_value = False
+    playwright_mock.chromium.launch.side_effect = None
+    with patch('app.scraper.scraper.async_playwright', side_effect=AssertionError("playwright restarted")):
+        await scraper.init_browser()
+
+    assert playwright_mock.chromium.launch.await_count == 3
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_close_browser():
@@ -100,71 +275,154 @@ async def test_close_browser_with_exception():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_is_first_run_true(test_db_session):
+async def test_reuse_browser_between_runs(patched_async_playwright, no_known_urls):
+    """Тестирует, что браузер запускается один раз и не закрывается между запусками"""
+    playwright_mock, browser_mock, context_mock, page_mock = patched_async_playwright
+    scraper = FTScraper(reuse_browser=True)
+    scraper.scrape_articles_with_pagination = AsyncMock(return_value=[])
+
+    await scraper.run_hourly_scraping()
+    await scraper.run_hourly_scraping()
+
+    playwright_mock.chromium.launch.assert_awaited_once()
+    browser_mock.close.assert_not_called()
+
+    await scraper.close_browser()
+
+    browser_mock.close.assert_awaited_once()
+    playwright_mock.stop.assert_awaited_once()
+    assert scraper.browser is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_is_first_run_true(patched_session):
     """Тестирует определение первого запуска (пустая база)"""
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        
-        mock_get_session.return_value = mock_session_generator()
-        
-        result = await FTScraper.is_first_run()
-        
-        assert result is True
+    result = await FTScraper.is_first_run()
+    
+    assert result is True
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_is_first_run_false(test_db_session):
+async def test_is_first_run_false(seed_articles, patched_session, make_article_row):
     """Тестирует определение НЕ первого запуска (есть статьи в базе)"""
     # Добавляем статью в тестовую базу
-    article = Article(
-        url="https://test.com/article",
-        title="Test Article",
-        content="Test content",
-        published_at=datetime.datetime.now(datetime.timezone.utc),
-        scraped_at=datetime.datetime.now(datetime.timezone.utc)
-    )
-    test_db_session.add(article)
-    await test_db_session.commit()
+    await seed_articles([make_article_row("https://test.com/article")])
+    
+    result = await FTScraper.is_first_run()
+    
+    assert result is False
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_is_first_run_cached_after_articles_found(seed_articles, patched_session, make_article_row):
+    """Тестирует, что после обнаружения статей база больше не опрашивается"""
+    await seed_articles([make_article_row("https://test.com/article")])
+    
+    assert await FTScraper.is_first_run() is False
     
     with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        
-        mock_get_session.return_value = mock_session_generator()
-        
-        result = await FTScraper.is_first_run()
-        
-        assert result is False
+        assert await FTScraper.is_first_run() is False
+    
+    mock_get_session.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_save_articles_to_db_ends_first_run(patched_session, sample_articles_list):
+    """Тестирует, что сохранение статей сбрасывает признак первого запуска"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    articles_data = [dict(article, published_at=now, scraped_at=now) for article in sample_articles_list]
+    
+    assert await FTScraper.is_first_run() is True
+    assert await FTScraper.save_articles_to_db(articles_data) == len(articles_data)
+    
+    assert FTScraper._first_run_cache is False
+    assert await FTScraper.is_first_run() is False
 
 
 @pytest.mark.unit
 def test_is_article_recent():
     """Тестирует проверку свежести статьи"""
-    now = datetime.datetime.now(datetime.timezone.utc)
+    now = datetime.datetime(2024, 1, 15, 12, 0, tzinfo=datetime.timezone.utc)
     
     # Статья опубликована 30 минут назад (свежая)
     recent_date = now - datetime.timedelta(minutes=30)
-    assert FTScraper._is_article_recent(recent_date, hours_limit=1) is True
+    assert FTScraper._is_article_recent(recent_date, hours_limit=1, now=now) is True
     
     # Статья опубликована 2 часа назад (не свежая)
     old_date = now - datetime.timedelta(hours=2)
-    assert FTScraper._is_article_recent(old_date, hours_limit=1) is False
+    assert FTScraper._is_article_recent(old_date, hours_limit=1, now=now) is False
+    
+    # Ровно на границе лимита статья еще считается свежей
+    assert FTScraper._is_article_recent(now - datetime.timedelta(hours=1), hours_limit=1, now=now) is True
+
+
+@pytest.mark.unit
+@freeze_time(FROZEN_NOW)
+def test_is_article_recent_other_timezone():
+    """Тестирует проверку свежести для даты не в UTC"""
+    moscow = datetime.timezone(datetime.timedelta(hours=3))
+    now = FROZEN_NOW.astimezone(moscow)
+
+    assert FTScraper._is_article_recent(now - datetime.timedelta(minutes=30), hours_limit=1) is True
+    assert FTScraper._is_article_recent(now - datetime.timedelta(hours=2), hours_limit=1) is False
+
+
+@pytest.mark.unit
+def test_make_time_filter():
+    """Тестирует, что фильтр запуска отсчитывает лимит от момента своего создания"""
+    scraper = FTScraper()
+
+    with freeze_time(FROZEN_NOW) as frozen:
+        within_month = scraper._make_time_filter(days=30)
+        last_hour = scraper._make_time_filter()
+        # Время идет, а лимит остается привязан к началу запуска
+        frozen.tick(datetime.timedelta(hours=2))
+
+        assert within_month(FROZEN_NOW - datetime.timedelta(days=29)) is True
+        assert within_month(FROZEN_NOW - datetime.timedelta(days=31)) is False
+        assert last_hour(FROZEN_NOW - datetime.timedelta(minutes=30)) is True
+        assert last_hour(FROZEN_NOW - datetime.timedelta(hours=2)) is False
+
+
+@pytest.fixture
+def non_utc_local_time(monkeypatch):
+    """Местная зона процесса отличается от UTC на 9 часов"""
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.unit
+def test_time_filters_treat_naive_dates_as_utc(non_utc_local_time):
+    """Тестирует, что наивные даты считаются UTC, а не местным временем"""
+    now = datetime.datetime(2024, 1, 15, 12, 0, tzinfo=datetime.timezone.utc)
+    naive_now = now.replace(tzinfo=None)
+
+    assert FTScraper._is_article_recent(naive_now - datetime.timedelta(minutes=30), hours_limit=1, now=now) is True
+    assert FTScraper._is_article_recent(naive_now - datetime.timedelta(hours=2), hours_limit=1, now=now) is False
+    assert FTScraper._is_article_recent(now - datetime.timedelta(minutes=30), hours_limit=1, now=naive_now) is True
+    assert FTScraper._is_article_within_days(naive_now - datetime.timedelta(days=29, hours=20), now=now) is True
+    assert FTScraper._is_article_within_days(naive_now - datetime.timedelta(days=30, hours=1), now=now) is False
 
 
 @pytest.mark.unit
 def test_is_article_within_days():
     """Тестирует проверку статьи в пределах дней"""
-    now = datetime.datetime.now(datetime.timezone.utc)
+    now = datetime.datetime(2024, 1, 15, 12, 0, tzinfo=datetime.timezone.utc)
     
     # Статья опубликована 15 дней назад (в пределах 30 дней)
     within_date = now - datetime.timedelta(days=15)
-    assert FTScraper._is_article_within_days(within_date, days_limit=30) is True
+    assert FTScraper._is_article_within_days(within_date, days_limit=30, now=now) is True
     
     # Статья опубликована 45 дней назад (вне пределов 30 дней)
     outside_date = now - datetime.timedelta(days=45)
-    assert FTScraper._is_article_within_days(outside_date, days_limit=30) is False
+    assert FTScraper._is_article_within_days(outside_date, days_limit=30, now=now) is False
 
 
 @pytest.mark.unit
@@ -178,14 +436,49 @@ def test_parse_publish_date():
 
 
 @pytest.mark.unit
+@pytest.mark.parametrize("date_str, expected", [
+    ("December 1 2023 12:05 am", datetime.datetime(2023, 12, 1, 0, 5, tzinfo=datetime.timezone.utc)),
+    ("March 9 2024 12:45 pm", datetime.datetime(2024, 3, 9, 12, 45, tzinfo=datetime.timezone.utc)),
+    ("july 4 2024 3:07 PM", datetime.datetime(2024, 7, 4, 15, 7, tzinfo=datetime.timezone.utc)),
+    ("August  5 2024\t9:5 am", datetime.datetime(2024, 8, 5, 9, 5, tzinfo=datetime.timezone.utc)),
+])
+def test_parse_publish_date_formats(date_str, expected):
+    """Тестирует парсинг полуночи, полудня и регистра в дате публикации"""
+    assert FTScraper._parse_publish_date(date_str) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("date_str", ["Smarch 15 2024 10:30 am", "February 30 2024 10:30 am", "January 15 2024 13:30 pm"])
+@freeze_time(FROZEN_NOW)
+def test_parse_publish_date_out_of_range(date_str):
+    """Тестирует даты, которые совпадают с форматом, но некорректны"""
+    assert FTScraper._parse_publish_date(date_str) == FROZEN_NOW
+
+
+@pytest.mark.unit
+def test_parse_publish_date_cached():
+    """Тестирует, что повторная дата берется из кэша, а неразобранная в кэш не попадает"""
+    _parse_publish_date_cached.cache_clear()
+
+    first = FTScraper._parse_publish_date("January 15 2024 10:30 am")
+    second = FTScraper._parse_publish_date("January 15 2024 10:30 am")
+    FTScraper._parse_publish_date("invalid date string")
+
+    assert first == second
+    info = _parse_publish_date_cached.cache_info()
+    assert info.hits == 1
+    assert info.currsize == 1
+
+
+@pytest.mark.unit
+@freeze_time(FROZEN_NOW)
 def test_parse_publish_date_invalid():
     """Тестирует парсинг неверной даты"""
     invalid_date_str = "invalid date string"
     result = FTScraper._parse_publish_date(invalid_date_str)
     
     # Должна вернуться текущая дата
-    now = datetime.datetime.now(datetime.timezone.utc)
-    assert (now - result).total_seconds() < 5  # Разница менее 5 секунд
+    assert result == FROZEN_NOW
 
 
 @pytest.mark.unit
@@ -204,10 +497,9 @@ def test_extract_article_data():
     </li>
     """
     
-    soup = BeautifulSoup(html, 'html.parser')
-    article_element = soup.find('li', class_='o-teaser-collection__item')
+    article_element = lxml.html.fragment_fromstring(html.strip())
     
-    result = scraper._extract_article_data(article_element)
+    result = scraper._extract_article_data_lxml(article_element)
     
     assert result is not None
     assert result['url'] == "https://www.ft.com/content/test-article"
@@ -218,6 +510,18 @@ def test_extract_article_data():
     assert isinstance(result['scraped_at'], datetime.datetime)
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize("href, expected", [
+    ("/content/test-article", "https://www.ft.com/content/test-article"),
+    ("https://www.ft.com/content/absolute", "https://www.ft.com/content/absolute"),
+    ("//www.ft.com/content/protocol-relative", "https://www.ft.com/content/protocol-relative"),
+    ("/content/../world", "https://www.ft.com/world"),
+])
+def test_to_absolute_url(href, expected):
+    """Тестирует построение абсолютного URL статьи (совпадает с urljoin)"""
+    assert _to_absolute_url(FT_BASE_URL, href) == expected
+
+
 @pytest.mark.unit
 def test_extract_article_data_premium():
     """Тестирует пропуск премиум статей"""
@@ -232,14 +536,97 @@ def test_extract_article_data_premium():
     </li>
     """
     
-    soup = BeautifulSoup(html, 'html.parser')
-    article_element = soup.find('li', class_='o-teaser-collection__item')
+    article_element = lxml.html.fragment_fromstring(html.strip())
     
-    result = scraper._extract_article_data(article_element)
+    result = scraper._extract_article_data_lxml(article_element)
     
     assert result is None  # Премиум статьи должны пропускаться
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize("html", [
+    """
+    <li class="o-teaser-collection__item o-teaser-collection__item--wide">
+        <a href="/tag/world" class="o-teaser__tag">World</a>
+        <a href="/content/full" class="js-teaser-heading-link">  Full <span>Article</span>  </a>
+        <a href="/content/full" class="js-teaser-standfirst-link">Standfirst text</a>
+        <time title="March 9 2024 12:45 pm">Mar 9 2024</time>
+    </li>
+    """,
+    """
+    <li class="o-teaser-collection__item">
+        <a href="https://example.com/external" class="js-teaser-heading-link">No tag or time</a>
+        <time>Undated</time>
+    </li>
+    """,
+    """
+    <li class="o-teaser-collection__item">
+        <span class="o-labels o-labels--premium">Premium</span>
+        <a href="/content/premium" class="js-teaser-heading-link">Premium</a>
+    </li>
+    """,
+    """
+    <li class="o-teaser-collection__item"><div>No heading link</div></li>
+    """,
+    """
+    <li class="o-teaser-collection__item">
+        <a href="/tag/world" class="o-teaser__tag">World<style>.tag { color: red }</style></a>
+        <a href="/content/script" class="js-teaser-heading-link">Hello <script>var a = 1;</script>World</a>
+        <a href="/content/script" class="js-teaser-standfirst-link"><template><b>Hidden</b></template>Shown<!-- note --></a>
+    </li>
+    """,
+])
+def test_extract_article_data_lxml_matches_bs4(html):
+    """Тестирует, что извлечение из lxml дает тот же результат, что и из BeautifulSoup"""
+    scraper = FTScraper()
+    scraped_at = datetime.datetime(2024, 3, 10, tzinfo=datetime.timezone.utc)
+
+    bs4_element = BeautifulSoup(html, 'lxml', parse_only=TEASER_STRAINER).find('li')
+    lxml_element = lxml.html.fragment_fromstring(html.strip())
+
+    assert scraper._extract_article_data_lxml(lxml_element, scraped_at=scraped_at) == \
+        _extract_article_data_bs4(scraper, bs4_element, scraped_at=scraped_at)
+
+
+@pytest.mark.unit
+def test_extract_article_data_lxml_first_occurrence():
+    """Тестирует, что из элемента lxml берется первое вхождение каждого поля"""
+    scraper = FTScraper()
+    scraped_at = datetime.datetime(2024, 3, 10, tzinfo=datetime.timezone.utc)
+
+    html = """
+    <li class="o-teaser-collection__item">
+        <time title="March 9 2024 12:45 pm">Mar 9 2024</time>
+        <a href="/content/first" class="js-teaser-heading-link">First</a>
+        <a href="/content/second" class="js-teaser-heading-link">Second</a>
+        <a href="/tag/world" class="o-teaser__tag">World</a>
+        <time title="March 1 2024 09:00 am">Mar 1 2024</time>
+    </li>
+    """
+    result = scraper._extract_article_data_lxml(lxml.html.fragment_fromstring(html.strip()), scraped_at=scraped_at)
+
+    assert result['url'] == "https://www.ft.com/content/first"
+    assert result['title'] == "First"
+    assert result['author'] == "World"
+    assert result['content'] == ""
+    assert result['published_at'] == datetime.datetime(2024, 3, 9, 12, 45, tzinfo=datetime.timezone.utc)
+
+
+@pytest.mark.unit
+def test_extract_article_data_lxml_premium_after_title():
+    """Тестирует пропуск премиум статьи, даже если метка стоит после заголовка"""
+    scraper = FTScraper()
+
+    html = """
+    <li class="o-teaser-collection__item">
+        <a href="/content/premium" class="js-teaser-heading-link">Premium</a>
+        <span class="o-labels--premium">Premium</span>
+    </li>
+    """
+
+    assert scraper._extract_article_data_lxml(lxml.html.fragment_fromstring(html.strip())) is None
+
+
 @pytest.mark.unit
 def test_extract_article_data_with_time_filter():
     """Тестирует извлечение данных с временным фильтром"""
@@ -254,13 +641,12 @@ def test_extract_article_data_with_time_filter():
     </li>
     """
     
-    soup = BeautifulSoup(html, 'html.parser')
-    article_element = soup.find('li', class_='o-teaser-collection__item')
+    article_element = lxml.html.fragment_fromstring(html.strip())
     
     # Фильтр: только статьи за последний день
     time_filter = lambda date: FTScraper._is_article_recent(date, hours_limit=24)
     
-    result = scraper._extract_article_data(article_element, time_filter)
+    result = scraper._extract_article_data_lxml(article_element, time_filter)
     
     assert result is None  # Старая статья должна быть отфильтрована
 
@@ -297,14 +683,151 @@ async def test_scrape_single_page(mock_playwright):
     assert len(result) == 1
     assert result[0]['title'] == "Article 1"
     page_mock.goto.assert_called_once()
+    page_mock.wait_for_selector.assert_awaited_once_with(ARTICLE_LIST_CSS, timeout=10000)
+    page_mock.content.assert_awaited_once()
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_scrape_single_page_no_articles():
+async def test_scrape_single_page_shares_scraped_at(mock_playwright):
+    """Тестирует, что у всех статей страницы одно время скрапинга"""
+    playwright_mock, browser_mock, context_mock, page_mock = mock_playwright
+    
+    scraper = FTScraper()
+    scraper.page = page_mock
+    
+    page_mock.content.return_value = """
+    <html>
+        <ul class="o-teaser-collection__list">
+            <li class="o-teaser-collection__item">
+                <a href="/content/test-1" class="js-teaser-heading-link">Article 1</a>
+            </li>
+            <li class="o-teaser-collection__item">
+                <a href="/content/test-2" class="js-teaser-heading-link">Article 2</a>
+            </li>
+        </ul>
+    </html>
+    """
+    
+    with patch('asyncio.sleep'):
+        result = await scraper.scrape_single_page(1)
+    
+    assert len(result) == 2
+    assert result[0]['scraped_at'] is result[1]['scraped_at']
+    # Без даты в разметке время публикации совпадает со временем скрапинга
+    assert result[0]['published_at'] == result[0]['scraped_at']
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_single_page_parses_only_article_list(mock_playwright):
+    """Тестирует, что разбирается только список статей, даже если у него несколько классов"""
+    playwright_mock, browser_mock, context_mock, page_mock = mock_playwright
+    
+    scraper = FTScraper()
+    scraper.page = page_mock
+    
+    page_mock.content.return_value = """
+    <html>
+        <nav><ul class="o-header__nav"><li class="o-teaser-collection__item">
+            <a href="/content/nav" class="js-teaser-heading-link">Navigation</a>
+        </li></ul></nav>
+        <ul class="o-teaser-collection__list js-stream-list">
+            <li class="o-teaser-collection__item">
+                <a href="/content/test-1" class="js-teaser-heading-link">Article 1</a>
+            </li>
+        </ul>
+    </html>
+    """
+    
+    with patch('asyncio.sleep'):
+        result = await scraper.scrape_single_page(1)
+    
+    assert [article['title'] for article in result] == ["Article 1"]
+
+
+@pytest.mark.unit
+def test_parse_articles_from_html(mock_html_content):
+    """Тестирует разбор статей из сырого HTML страницы"""
+    scraper = FTScraper()
+    scraped_at = datetime.datetime(2024, 1, 15, 12, 0, tzinfo=datetime.timezone.utc)
+
+    result = scraper._parse_articles_from_html(mock_html_content, scraped_at=scraped_at)
+
+    assert [article['url'] for article in result] == [
+        "https://www.ft.com/content/test-article-1",
+        "https://www.ft.com/content/test-article-2",
+    ]
+    assert result[0]['title'] == "Test Article 1"
+    assert result[1]['published_at'] == datetime.datetime(2024, 1, 15, 11, 30, tzinfo=datetime.timezone.utc)
+    assert all(article['scraped_at'] == scraped_at for article in result)
+
+
+@pytest.mark.unit
+def test_parse_articles_from_html_first_list_only():
+    """Тестирует, что при разборе страницы берутся тизеры только первого списка статей"""
+    scraper = FTScraper()
+    content = """
+    <html><body>
+        <ul class="o-teaser-collection__list">
+            <li class="o-teaser-collection__item"><a href="/content/a" class="js-teaser-heading-link">A</a></li>
+            <li class="o-teaser-collection__item">
+                <div><ul class="o-labels"><li>World</li></ul></div>
+                <a href="/content/b" class="js-teaser-heading-link">B</a>
+            </li>
+        </ul>
+        <ul class="o-teaser-collection__list">
+            <li class="o-teaser-collection__item"><a href="/content/c" class="js-teaser-heading-link">C</a></li>
+        </ul>
+    </body></html>
+    """
+
+    result = scraper._parse_articles_from_html(content)
+
+    assert [article['title'] for article in result] == ["A", "B"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("content", ["", "   ", "<html><body><p>Nothing here</p></body></html>"])
+def test_parse_articles_from_html_without_list(content):
+    """Тестирует разбор пустой страницы и страницы без списка статей"""
+    assert FTScraper()._parse_articles_from_html(content) == []
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("premium_marker, expected_titles", [
+    ('<span class="o-labels o-labels--premium">Premium</span>', ["Free"]),
+    ('', ["Premium", "Free"]),
+])
+def test_parse_articles_from_html_premium_precheck(premium_marker, expected_titles):
+    """Тестирует, что метка премиум ищется в тизерах, только если она есть в HTML страницы"""
+    scraper = FTScraper()
+    content = f"""
+    <ul class="o-teaser-collection__list">
+        <li class="o-teaser-collection__item">
+            {premium_marker}
+            <a href="/content/premium" class="js-teaser-heading-link">Premium</a>
+        </li>
+        <li class="o-teaser-collection__item">
+            <a href="/content/free" class="js-teaser-heading-link">Free</a>
+        </li>
+    </ul>
+    """
+
+    with patch.object(scraper, '_extract_article_data_lxml',
+                      wraps=scraper._extract_article_data_lxml) as extract_mock:
+        result = scraper._parse_articles_from_html(content)
+
+    assert [article['title'] for article in result] == expected_titles
+    assert {call.kwargs['check_premium'] for call in extract_mock.call_args_list} == {bool(premium_marker)}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_single_page_no_articles(mock_playwright):
     """Тестирует скрапинг страницы без статей"""
     scraper = FTScraper()
-    page_mock = AsyncMock()
+    _, _, _, page_mock = mock_playwright
     scraper.page = page_mock
     
     # HTML без списка статей
@@ -319,82 +842,108 @@ async def test_scrape_single_page_no_articles():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_save_articles_to_db(test_db_session):
+async def test_save_articles_to_db(test_db_session, patched_session, make_article_row):
     """Тестирует сохранение статей в базу данных"""
     articles_data = [
-        {
-            "url": "https://test.com/article-1",
-            "title": "Article 1",
-            "content": "Content 1",
-            "author": "Author 1",
-            "published_at": datetime.datetime.now(datetime.timezone.utc),
-            "scraped_at": datetime.datetime.now(datetime.timezone.utc)
-        },
-        {
-            "url": "https://test.com/article-2",
-            "title": "Article 2",
-            "content": "Content 2",
-            "author": "Author 2",
-            "published_at": datetime.datetime.now(datetime.timezone.utc),
-            "scraped_at": datetime.datetime.now(datetime.timezone.utc)
-        }
+        make_article_row("https://test.com/article-1", "Article 1"),
+        make_article_row("https://test.com/article-2", "Article 2"),
     ]
     
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        
-        mock_get_session.return_value = mock_session_generator()
-        
-        saved_count = await FTScraper.save_articles_to_db(articles_data)
+    saved_count = await FTScraper.save_articles_to_db(articles_data)
     
     assert saved_count == 2
     
     # Проверяем, что статьи действительно сохранены
-    result = await test_db_session.execute(select(Article))
-    all_articles = result.scalars().all()
-    assert len(all_articles) == 2
+    assert await test_db_session.scalar(select(func.count()).select_from(Article)) == 2
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_save_articles_to_db_duplicate(test_db_session):
+async def test_save_articles_to_db_duplicate(seed_articles, patched_session, make_article_row):
     """Тестирует обработку дубликатов при сохранении"""
     # Сначала добавляем статью
-    article = Article(
-        url="https://test.com/duplicate",
-        title="Original",
-        content="Original content",
-        published_at=datetime.datetime.now(datetime.timezone.utc),
-        scraped_at=datetime.datetime.now(datetime.timezone.utc)
-    )
-    test_db_session.add(article)
-    await test_db_session.commit()
+    await seed_articles([make_article_row("https://test.com/duplicate", "Original")])
     
-    # Пытаемся добавить дубликат
-    articles_data = [
-        {
-            "url": "https://test.com/duplicate",  # Тот же URL
-            "title": "Duplicate",
-            "content": "Duplicate content",
-            "author": "Author",
-            "published_at": datetime.datetime.now(datetime.timezone.utc),
-            "scraped_at": datetime.datetime.now(datetime.timezone.utc)
-        }
-    ]
+    # Пытаемся добавить дубликат с тем же URL
+    articles_data = [make_article_row("https://test.com/duplicate", "Duplicate")]
     
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        
-        mock_get_session.return_value = mock_session_generator()
-        
-        saved_count = await FTScraper.save_articles_to_db(articles_data)
+    saved_count = await FTScraper.save_articles_to_db(articles_data)
     
     # Дубликат не должен быть сохранен
     assert saved_count == 0
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_save_articles_to_db_mixed(seed_articles, patched_session, make_article_row):
+    """Тестирует пакет из дубликата и двух новых статей: сохраняются только новые"""
+    await seed_articles([make_article_row("https://test.com/existing", "Original")])
+
+    saved_count = await FTScraper.save_articles_to_db([
+        make_article_row("https://test.com/existing", "Duplicate"),
+        make_article_row("https://test.com/new-1", "New 1"),
+        make_article_row("https://test.com/new-2", "New 2"),
+    ])
+
+    assert saved_count == 2
+    titles = (await patched_session.scalars(select(Article.title).order_by(Article.url))).all()
+    # Существующая статья не перезаписана
+    assert titles == ["Original", "New 1", "New 2"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_save_articles_to_db_skips_invalid_row(patched_session, make_article_row):
+    """Тестирует, что одна некорректная статья не мешает сохранить остальные в пакете"""
+    valid_rows = [make_article_row(f"https://test.com/valid-{i}") for i in range(5)]
+    invalid_row = make_article_row("https://test.com/invalid")
+    del invalid_row["published_at"]
+
+    with patch('asyncio.sleep') as mock_sleep:
+        saved_count = await FTScraper.save_articles_to_db(valid_rows + [invalid_row])
+
+    assert saved_count == 5
+    mock_sleep.assert_not_called()
+    assert await patched_session.scalar(select(func.count()).select_from(Article)) == 5
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_save_articles_to_db_falls_back_to_single_rows(patched_session, make_article_row):
+    """Тестирует, что при отказе базы пакет сохраняется по одной статье, без повторных попыток"""
+    rows = [make_article_row(f"https://test.com/valid-{i}") for i in range(5)]
+    rows.insert(2, dict(make_article_row("https://test.com/invalid"), published_at=None))
+
+    # Проверку пропускаем, чтобы некорректная строка дошла до NOT NULL в базе
+    with patch.object(FTScraper, '_is_valid_article', return_value=True), \
+         patch('asyncio.sleep') as mock_sleep:
+        saved_count = await FTScraper.save_articles_to_db(rows)
+
+    assert saved_count == 5
+    mock_sleep.assert_not_called()
+    urls = (await patched_session.scalars(select(Article.url).order_by(Article.url))).all()
+    assert urls == [f"https://test.com/valid-{i}" for i in range(5)]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("changes, is_valid", [
+    ({}, True),
+    ({"content": ""}, True),  # У тизера может не быть описания
+    ({"author": None}, True),
+    ({"title": ""}, False),
+    ({"content": None}, False),
+    ({"published_at": None}, False),
+    ({"scraped_at": "2024-01-15T10:30:00+00:00"}, False),
+    ({"title": "x" * 513}, False),
+    ({"url": "https://test.com/" + "x" * 1024}, False),
+])
+def test_is_valid_article(make_article_row, changes, is_valid):
+    """Тестирует проверку статьи на ограничения таблицы"""
+    row = dict(make_article_row("https://test.com/article"), **changes)
+
+    assert FTScraper._is_valid_article(row) is is_valid
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_save_articles_to_db_empty_list():
@@ -405,7 +954,7 @@ async def test_save_articles_to_db_empty_list():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_save_articles_to_db_invalid_data(test_db_session):
+async def test_save_articles_to_db_invalid_data(patched_session):
     """Тестирует обработку невалидных данных"""
     invalid_articles = [
         {
@@ -415,20 +964,153 @@ async def test_save_articles_to_db_invalid_data(test_db_session):
         }
     ]
     
-    with patch('app.scraper.scraper.get_session') as mock_get_session:
-        async def mock_session_generator():
-            yield test_db_session
-        
-        mock_get_session.return_value = mock_session_generator()
-        
-        saved_count = await FTScraper.save_articles_to_db(invalid_articles)
+    saved_count = await FTScraper.save_articles_to_db(invalid_articles)
     
     assert saved_count == 0
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_save_articles_to_db_skips_invalid_rows(test_db_session, patched_session, make_article_row):
+    """Тестирует, что невалидные статьи отбрасываются, а остальные сохраняются одним пакетом"""
+    articles_data = [make_article_row(f"https://test.com/batch-{i}", f"Article {i}") for i in range(2)]
+    articles_data.insert(1, {"url": None, "title": "Bad URL", "content": "Content"})
+    
+    saved_count = await FTScraper.save_articles_to_db(articles_data)
+    
+    assert saved_count == 2
+    
+    result = await test_db_session.execute(select(Article.url))
+    assert sorted(result.scalars().all()) == ["https://test.com/batch-0", "https://test.com/batch-1"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insert_new_articles_skips_known_urls(test_db_session, seed_articles, make_article_row):
+    """Тестирует сохранение без ON CONFLICT: дубликаты из базы и из пакета отбрасываются"""
+    await seed_articles([make_article_row("https://test.com/known")])
+    rows = [
+        make_article_row("https://test.com/known"),
+        make_article_row("https://test.com/new"),
+        make_article_row("https://test.com/new"),
+    ]
+    
+    saved_count = await FTScraper._insert_new_articles(test_db_session, rows)
+    
+    assert saved_count == 1
+    assert await test_db_session.scalar(select(func.count()).select_from(Article)) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_save_articles_to_db_uses_copy_for_large_postgres_batch():
+    """Тестирует, что большой пакет на PostgreSQL сохраняется через COPY"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    articles_data = [
+        {
+            "url": f"https://test.com/copy-{i}",
+            "title": f"Article {i}",
+            "content": f"Content {i}",
+            "published_at": now,
+            "scraped_at": now
+        }
+        for i in range(COPY_THRESHOLD)
+    ]
+    
+    mock_session = AsyncMock()
+    mock_session.get_bind = MagicMock()
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
+    
+    async def mock_session_generator():
+        yield mock_session
+    
+    with patch('app.scraper.scraper.get_session', return_value=mock_session_generator()), \
+         patch.object(FTScraper, '_bulk_copy_articles', AsyncMock(return_value=COPY_THRESHOLD)) as mock_copy:
+        saved_count = await FTScraper.save_articles_to_db(articles_data)
+    
+    assert saved_count == COPY_THRESHOLD
+    mock_copy.assert_called_once()
+    mock_session.execute.assert_not_called()
+    mock_session.commit.assert_called_once()
+
+
+def _mock_copy_session():
+    """Мок сессии PostgreSQL с сырым соединением asyncpg, возвращает (session, asyncpg_connection)"""
+    driver_connection = MagicMock()
+    driver_connection.copy_records_to_table = AsyncMock()
+    raw_connection = MagicMock(driver_connection=driver_connection)
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=raw_connection)
+    session = AsyncMock()
+    session.connection = AsyncMock(return_value=connection)
+    session.execute.return_value = MagicMock(**{"scalars.return_value.all.return_value": [1, 2]})
+    return session, driver_connection
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_copy_articles_records(make_article_row):
+    """Тестирует записи и порядок колонок, которые передаются в COPY"""
+    rows = [make_article_row("https://test.com/copy-1", "First"), make_article_row("https://test.com/copy-2")]
+    rows[1]["author"] = "Author"
+    session, driver_connection = _mock_copy_session()
+
+    saved_count = await FTScraper._bulk_copy_articles(session, rows)
+
+    assert saved_count == 2
+    driver_connection.copy_records_to_table.assert_awaited_once()
+    args, kwargs = driver_connection.copy_records_to_table.call_args
+    assert args == ('articles_staging',)
+    assert kwargs['columns'] == ['url', 'title', 'content', 'author', 'published_at', 'scraped_at']
+    assert kwargs['records'] == [
+        ("https://test.com/copy-1", "First", "Content", None, rows[0]["published_at"], rows[0]["scraped_at"]),
+        ("https://test.com/copy-2", "Title", "Content", "Author", rows[1]["published_at"], rows[1]["scraped_at"]),
+    ]
+    # Временная таблица создается до COPY, перенос в articles - после
+    statements = [str(call.args[0]) for call in session.execute.await_args_list]
+    assert statements[0].startswith("CREATE TEMP TABLE articles_staging")
+    assert statements[1].startswith("INSERT INTO articles")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_copy_articles_wraps_asyncpg_errors(make_article_row):
+    """Тестирует, что ошибки данных в COPY приходят как DataError SQLAlchemy (для пересохранения по одной)"""
+    from asyncpg.exceptions import StringDataRightTruncationError
+    from sqlalchemy.exc import DataError
+
+    session, driver_connection = _mock_copy_session()
+    driver_connection.copy_records_to_table.side_effect = StringDataRightTruncationError("value too long")
+
+    with pytest.raises(DataError):
+        await FTScraper._bulk_copy_articles(session, [make_article_row("https://test.com/copy")])
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL", "").startswith("postgresql"),
+                    reason="COPY проверяется только на PostgreSQL (TEST_DATABASE_URL)")
+async def test_save_articles_to_db_copy_on_postgres(patched_session, seed_articles, make_article_row):
+    """Тестирует сохранение большого пакета через COPY на настоящем PostgreSQL"""
+    await seed_articles([make_article_row("https://test.com/copy-0", "Original")])
+    rows = [make_article_row(f"https://test.com/copy-{i}", f"Article {i}") for i in range(COPY_THRESHOLD)]
+    # Дубликат внутри пакета тоже пропускается
+    rows.append(make_article_row("https://test.com/copy-1", "Duplicate"))
+
+    saved_count = await FTScraper.save_articles_to_db(rows)
+
+    assert saved_count == COPY_THRESHOLD - 1
+    assert await patched_session.scalar(select(func.count()).select_from(Article)) == COPY_THRESHOLD
+    titles = (await patched_session.scalars(
+        select(Article.title).where(Article.url.in_(["https://test.com/copy-0", "https://test.com/copy-1"]))
+        .order_by(Article.url)
+    )).all()
+    assert titles == ["Original", "Article 1"]
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_run_scraping_first_run():
+async def test_run_scraping_first_run(no_known_urls, queued_pagination, make_article_row):
     """Интеграционный тест полного цикла скрапинга при первом запуске"""
     scraper = FTScraper()
     
@@ -436,16 +1118,7 @@ async def test_run_scraping_first_run():
     scraper.init_browser = AsyncMock()
     scraper.close_browser = AsyncMock()
     scraper.is_first_run = AsyncMock(return_value=True)
-    scraper.scrape_articles_with_pagination = AsyncMock(return_value=[
-        {
-            "url": "https://test.com/article",
-            "title": "Test Article",
-            "content": "Test content",
-            "author": "Test Author",
-            "published_at": datetime.datetime.now(datetime.timezone.utc),
-            "scraped_at": datetime.datetime.now(datetime.timezone.utc)
-        }
-    ])
+    scraper.scrape_articles_with_pagination = queued_pagination([make_article_row("https://test.com/article")])
     scraper.save_articles_to_db = AsyncMock(return_value=1)
     
     await scraper.run_scraping()
@@ -456,6 +1129,7 @@ async def test_run_scraping_first_run():
     scraper.scrape_articles_with_pagination.assert_called_once()
     scraper.save_articles_to_db.assert_called_once()
     scraper.close_browser.assert_called_once()
+    no_known_urls.assert_awaited_once()
     
     # Проверяем, что для первого запуска использованы правильные параметры
     args, kwargs = scraper.scrape_articles_with_pagination.call_args
@@ -464,7 +1138,7 @@ async def test_run_scraping_first_run():
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_run_scraping_normal_run():
+async def test_run_scraping_normal_run(no_known_urls):
     """Интеграционный тест полного цикла скрапинга при обычном запуске"""
     scraper = FTScraper()
     
@@ -511,7 +1185,8 @@ async def test_scrape_articles_with_pagination():
         nonlocal call_count
         call_count += 1
         if call_count <= 2:
-            return [{"title": f"Article {call_count}", "published_at": datetime.datetime.now(datetime.timezone.utc)}]
+            return [{"url": f"https://www.ft.com/content/{call_count}", "title": f"Article {call_count}",
+                     "published_at": datetime.datetime.now(datetime.timezone.utc)}]
         else:
             return []  # Третья страница пустая
     
@@ -521,4 +1196,227 @@ async def test_scrape_articles_with_pagination():
         result = await scraper.scrape_articles_with_pagination(max_pages=5)
     
     assert len(result) == 2  # Две статьи с первых двух страниц
-    assert call_count == 5  # Должно попытаться скрапить 3 страницы подряд без результатов
\ No newline at end of file
+    assert call_count == 4  # Останавливается после 2 страниц подряд без результатов
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_articles_with_pagination_concurrent():
+    """Тестирует параллельный скрапинг страниц через пул вкладок"""
+    scraper = FTScraper(concurrency=3)
+    pages = [MagicMock(name=f"page{i}") for i in range(3)]
+    scraper._page_pool = asyncio.Queue()
+    for page in pages:
+        scraper._page_pool.put_nowait(page)
+
+    in_flight = 0
+    all_started = asyncio.Event()
+    used_pages = set()
+
+    async def mock_scrape_single_page(page_num, time_filter_func=None, page=None):
+        nonlocal in_flight
+        used_pages.add(page)
+        in_flight += 1
+        if in_flight == 3:
+            all_started.set()
+        # Каждая страница ждет, пока остальные страницы окна не начнут загрузку
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+        return [{"url": f"https://www.ft.com/content/{page_num}", "title": f"Article {page_num}",
+                 "published_at": datetime.datetime.now(datetime.timezone.utc)}]
+
+    scraper.scrape_single_page = mock_scrape_single_page
+
+    with patch('asyncio.sleep'):
+        result = await scraper.scrape_articles_with_pagination(max_pages=3)
+
+    assert [article["title"] for article in result] == ["Article 1", "Article 2", "Article 3"]
+    assert used_pages == set(pages)
+    assert scraper._page_pool.qsize() == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_dedup():
+    """Тестирует, что статья, повторившаяся на следующей странице, собирается один раз"""
+    scraper = FTScraper()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    pages = {
+        1: [{"url": "https://www.ft.com/content/a", "title": "A", "published_at": now},
+            {"url": "https://www.ft.com/content/b", "title": "B", "published_at": now}],
+        2: [{"url": "https://www.ft.com/content/b", "title": "B", "published_at": now},
+            {"url": "https://www.ft.com/content/c", "title": "C", "published_at": now}],
+    }
+
+    async def mock_scrape_single_page(page_num, time_filter_func=None):
+        return pages.get(page_num, [])
+
+    scraper.scrape_single_page = mock_scrape_single_page
+
+    with patch('asyncio.sleep'):
+        result = await scraper.scrape_articles_with_pagination(max_pages=2)
+
+    assert [article["title"] for article in result] == ["A", "B", "C"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_save_pipeline(no_known_urls):
+    """Тестирует, что статьи сохраняются в базу до окончания скрапинга всех страниц"""
+    scraper = FTScraper()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    first_page_saved = asyncio.Event()
+    saved_batches = []
+
+    async def mock_scrape_single_page(page_num, time_filter_func=None):
+        if page_num == 2:
+            # Вторая страница загружается только после сохранения первой
+            await asyncio.wait_for(first_page_saved.wait(), timeout=1)
+        return [{"url": f"https://www.ft.com/content/{page_num}", "title": f"Article {page_num}", "published_at": now}]
+
+    async def mock_save_articles_to_db(articles):
+        saved_batches.append([article["title"] for article in articles])
+        first_page_saved.set()
+        return len(articles)
+
+    scraper.scrape_single_page = mock_scrape_single_page
+    scraper.save_articles_to_db = mock_save_articles_to_db
+
+    with patch('asyncio.sleep'), patch('app.scraper.scraper.SAVE_BATCH_SIZE', 1):
+        articles_data, saved_count = await scraper._scrape_and_save(max_pages=2)
+
+    assert saved_batches == [["Article 1"], ["Article 2"]]
+    assert len(articles_data) == 2
+    assert saved_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_and_save_skips_known_urls(patched_session, seed_articles, make_article_row):
+    """Тестирует, что статьи, уже сохраненные в базе, не отправляются на сохранение"""
+    old = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=30)
+
+    await seed_articles([
+        make_article_row("https://test.com/known"),
+        make_article_row("https://test.com/old", scraped_at=old),
+    ])
+
+    scraper = FTScraper()
+    scraper.scrape_single_page = AsyncMock(side_effect=[
+        [make_article_row("https://test.com/known"), make_article_row("https://test.com/new")], [], [], []
+    ])
+    scraper.save_articles_to_db = AsyncMock(side_effect=lambda articles: len(articles))
+
+    with patch('asyncio.sleep'):
+        articles_data, saved_count = await scraper._scrape_and_save(max_pages=4)
+
+    # Собранными считаются все статьи, а на сохранение уходят только новые
+    assert [article["url"] for article in articles_data] == ["https://test.com/known", "https://test.com/new"]
+    scraper.save_articles_to_db.assert_awaited_once()
+    assert [article["url"] for article in scraper.save_articles_to_db.await_args.args[0]] == ["https://test.com/new"]
+    assert saved_count == 1
+    # Известные URL не переживают запуск
+    assert scraper._known_urls == set()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_load_known_urls_only_recent(patched_session, seed_articles, make_article_row):
+    """Тестирует, что загружаются только URL статей, собранных за последние дни"""
+    old = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=30)
+    await seed_articles([
+        make_article_row("https://test.com/known"),
+        make_article_row("https://test.com/old", scraped_at=old),
+    ])
+
+    assert await FTScraper._load_known_urls() == {"https://test.com/known"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_and_save_error_after_saved_pages(no_known_urls, make_article_row):
+    """Тестирует, что при ошибке пагинации после сохраненных страниц собранные статьи не теряются"""
+    scraper = FTScraper()
+    scraper.scrape_single_page = AsyncMock(side_effect=[
+        [make_article_row("https://test.com/page-1")],
+        [make_article_row("https://test.com/page-2")],
+        RuntimeError("Browser crashed"),
+    ])
+    scraper.save_articles_to_db = AsyncMock(side_effect=lambda articles: len(articles))
+
+    with patch('asyncio.sleep'):
+        articles_data, saved_count = await scraper._scrape_and_save(max_pages=5)
+
+    assert [article["url"] for article in articles_data] == ["https://test.com/page-1", "https://test.com/page-2"]
+    assert saved_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pagination_early_stop():
+    """Тестирует остановку пагинации, когда первая статья страницы старше временного лимита"""
+    scraper = FTScraper()
+    old = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=2)
+    call_count = 0
+
+    async def mock_scrape_single_page(page_num, time_filter_func=None):
+        nonlocal call_count
+        call_count += 1
+        articles = [{"url": f"https://www.ft.com/content/{page_num}-{i}", "published_at": old} for i in range(3)]
+        # Как и настоящий скрапер, фильтр отбрасывает старые статьи еще при разборе страницы
+        return [article for article in articles if time_filter_func(article["published_at"])]
+
+    scraper.scrape_single_page = mock_scrape_single_page
+
+    with patch('asyncio.sleep'):
+        result = await scraper.scrape_articles_with_pagination(
+            max_pages=5,
+            time_filter_func=lambda date: FTScraper._is_article_recent(date, 1)
+        )
+
+    assert result == []
+    assert call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scrape_articles_with_pagination_window_order():
+    """Тестирует, что следующее окно страниц начинается только после завершения всех страниц текущего"""
+    scraper = FTScraper(concurrency=3)
+    scraper._page_pool = asyncio.Queue()
+    for i in range(3):
+        scraper._page_pool.put_nowait(MagicMock(name=f"page{i}"))
+
+    events = []
+    # Пауза между окнами подменяется, а страницам нужны настоящие переключения цикла событий
+    real_sleep = asyncio.sleep
+
+    async def mock_scrape_single_page(page_num, time_filter_func=None, page=None):
+        events.append(("start", page_num))
+        # Страницы окна завершаются в обратном порядке
+        for _ in range(4 - (page_num - 1) % 3):
+            await real_sleep(0)
+        events.append(("end", page_num))
+        return [{"url": f"https://www.ft.com/content/{page_num}", "published_at": datetime.datetime.now(datetime.timezone.utc)}]
+
+    scraper.scrape_single_page = mock_scrape_single_page
+
+    with patch('app.scraper.scraper.asyncio.sleep', new=AsyncMock()):
+        result = await scraper.scrape_articles_with_pagination(max_pages=6)
+
+    # Статьи идут в порядке страниц, независимо от порядка завершения
+    assert [article["url"][-1] for article in result] == ["1", "2", "3", "4", "5", "6"]
+    assert [num for event, num in events if event == "end"][:3] == [3, 2, 1]
+    first_window_end = max(events.index(("end", num)) for num in (1, 2, 3))
+    second_window_start = min(events.index(("start", num)) for num in (4, 5, 6))
+    assert first_window_end < second_window_start
+
+
+@pytest.mark.unit
+def test_get_scraper_concurrency_from_env(monkeypatch):
+    """Тестирует, что общий скрапер берет число параллельных страниц из SCRAPER_CONCURRENCY"""
+    monkeypatch.setenv("SCRAPER_CONCURRENCY", "4")
+
+    scraper = get_scraper()
+
+    assert scraper.concurrency == 4
+    assert scraper.reuse_browser is True